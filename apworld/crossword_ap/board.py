@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+Position = Tuple[int, int]
+
+# (row, col, length, across, flat indices of the cells this placement filled)
+JournalEntry = Tuple[int, int, int, bool, Tuple[int, ...]]
+
+
+class CrosswordBoard:
+    """
+    Mutable crossword grid backed by flat row-major bytearrays.
+
+    `cells` holds a small letter code per cell (0 means empty), `across`/`down` flag cells already
+    covered by a word in that direction. Every placement is journaled, so undoing one costs only
+    the length of the word and search code can back up instead of starting from an empty grid.
+    """
+
+    __slots__ = (
+        "rows",
+        "cols",
+        "cells",
+        "across",
+        "down",
+        "letter_positions",
+        "revision",
+        "_codes",
+        "_letters",
+        "_journal",
+    )
+
+    def __init__(self, rows: int, cols: int) -> None:
+        size = rows * cols
+        self.rows = rows
+        self.cols = cols
+        self.cells = bytearray(size)
+        self.across = bytearray(size)
+        self.down = bytearray(size)
+        # Filled cells per letter in fill order; undo removes from the end, so order is stable.
+        self.letter_positions: Dict[str, List[Position]] = {}
+        # Bumped by every place/undo, so derived data can tell when it is out of date.
+        self.revision = 0
+        self._codes: Dict[str, int] = {}
+        self._letters: List[str] = [""]
+        self._journal: List[JournalEntry] = []
+
+    def __len__(self) -> int:
+        """Number of words currently placed."""
+        return len(self._journal)
+
+    def letter(self, row: int, col: int) -> str:
+        """Letter at the cell, or "" if it is empty."""
+        return self._letters[self.cells[row * self.cols + col]]
+
+    def encode(self, word: str) -> List[int]:
+        """Letter codes for word; letters never placed on this board encode as 0 and match no cell."""
+        codes = self._codes
+        return [codes.get(letter, 0) for letter in word]
+
+    def place(self, word: str, row: int, col: int, across: bool) -> None:
+        """Write word starting at (row, col) without validation; see the generator's _can_place_* checks."""
+        cols = self.cols
+        cells = self.cells
+        flags = self.across if across else self.down
+        step = 1 if across else cols
+        index = row * cols + col
+        filled: List[int] = []
+        for letter in word:
+            if not cells[index]:
+                cells[index] = self._code_for(letter)
+                filled.append(index)
+                self.letter_positions.setdefault(letter, []).append((index // cols, index % cols))
+            flags[index] = 1
+            index += step
+        self._journal.append((row, col, len(word), across, tuple(filled)))
+        self.revision += 1
+
+    def undo(self) -> None:
+        """Remove the most recent placement."""
+        row, col, length, across, filled = self._journal.pop()
+        self.revision += 1
+        cols = self.cols
+        cells = self.cells
+        flags = self.across if across else self.down
+        step = 1 if across else cols
+        index = row * cols + col
+        for _ in range(length):
+            flags[index] = 0
+            index += step
+        for index in reversed(filled):
+            letter = self._letters[cells[index]]
+            cells[index] = 0
+            positions = self.letter_positions[letter]
+            positions.pop()
+            if not positions:
+                del self.letter_positions[letter]
+
+    def rollback(self, placements: int) -> None:
+        """Undo placements until only the first `placements` remain."""
+        while len(self._journal) > placements:
+            self.undo()
+
+    def to_rows(self) -> List[List[str]]:
+        """Copy of the grid as a list of rows, "" for empty cells."""
+        letters = self._letters
+        cols = self.cols
+        return [
+            [letters[code] for code in self.cells[start : start + cols]]
+            for start in range(0, self.rows * cols, cols)
+        ]
+
+    def _code_for(self, letter: str) -> int:
+        code = self._codes.get(letter)
+        if code is None:
+            code = len(self._letters)
+            if code > 255:
+                raise ValueError("CrosswordBoard supports at most 255 distinct letters")
+            self._codes[letter] = code
+            self._letters.append(letter)
+        return code
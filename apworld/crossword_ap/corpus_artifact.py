@@ -0,0 +1,189 @@
+"""
+Binary form of the compiled word list (crossword_wordlist.bin).
+
+Layout, little-endian: a header (magic, format version, entry count, category count, SHA-256 of
+the source text) followed by length-prefixed sections:
+
+1. category names, newline separated
+2. words, newline separated, in word list order
+3. clues, newline separated
+4. one category id byte per entry
+5. length buckets as u32 runs of (length, count, word ids...)
+6. letter index keys as u32 triples of (length, position, letter code point)
+7. zlib-compressed bitsets, one fixed-width row per length bucket and then per letter index key
+
+Word ids are positions in the word list, exactly as in WordIndex, so the tables load straight into
+WordCorpus without parsing or rebuilding the index.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+MAGIC = b"CWCORPUS"
+ARTIFACT_VERSION = 1
+ARTIFACT_RESOURCE = "crossword_wordlist.bin"
+
+_HEADER = struct.Struct("<8sHII32s")
+_SECTION = struct.Struct("<I")
+_SECTION_COUNT = 7
+
+PositionalKey = Tuple[int, int, str]
+
+
+class ArtifactTables(NamedTuple):
+    source_hash: str
+    words: List[str]
+    clues: List[str]
+    categories: List[str]
+    category_ids: bytes
+    by_length: Dict[int, Tuple[int, ...]]
+    length_masks: Dict[int, int]
+    positional: Dict[PositionalKey, int]
+
+
+def source_digest(source: bytes) -> str:
+    """Content hash of the word list text, as stored in the artifact header."""
+    return hashlib.sha256(source).hexdigest()
+
+
+def encode_artifact(
+    source_hash: str,
+    words: Sequence[str],
+    clues: Sequence[str],
+    categories: Sequence[str],
+    category_ids: Sequence[int],
+    by_length: Dict[int, Tuple[int, ...]],
+    length_masks: Dict[int, int],
+    positional: Dict[PositionalKey, int],
+) -> bytes:
+    if len(categories) > 256:
+        raise ValueError("The corpus artifact supports at most 256 categories")
+    width = _row_width(len(words))
+    buckets = array("I")
+    for length, word_ids in by_length.items():
+        buckets.append(length)
+        buckets.append(len(word_ids))
+        buckets.extend(word_ids)
+    keys = array("I")
+    rows = [length_masks[length].to_bytes(width, "little") for length in by_length]
+    for (length, position, letter), mask in positional.items():
+        keys.extend((length, position, ord(letter)))
+        rows.append(mask.to_bytes(width, "little"))
+
+    sections = (
+        _join_strings(categories),
+        _join_strings(words),
+        _join_strings(clues),
+        bytes(category_ids),
+        _array_bytes(buckets),
+        _array_bytes(keys),
+        zlib.compress(b"".join(rows), 9),
+    )
+    parts = [_HEADER.pack(MAGIC, ARTIFACT_VERSION, len(words), len(categories), bytes.fromhex(source_hash))]
+    for section in sections:
+        parts.append(_SECTION.pack(len(section)))
+        parts.append(section)
+    return b"".join(parts)
+
+
+def decode_artifact(data: bytes) -> ArtifactTables:
+    """Read an artifact; raises ValueError if it is not a complete artifact of this format version."""
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError("Corpus artifact is truncated")
+    magic, version, entry_count, category_count, digest = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("Not a corpus artifact")
+    if version != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported corpus artifact version {version}")
+
+    sections: List[memoryview] = []
+    offset = _HEADER.size
+    for _ in range(_SECTION_COUNT):
+        if offset + _SECTION.size > len(view):
+            raise ValueError("Corpus artifact is truncated")
+        (size,) = _SECTION.unpack_from(view, offset)
+        offset += _SECTION.size
+        if offset + size > len(view):
+            raise ValueError("Corpus artifact is truncated")
+        sections.append(view[offset : offset + size])
+        offset += size
+
+    categories = [sys.intern(name) for name in _split_strings(sections[0], category_count)]
+    words = _split_strings(sections[1], entry_count)
+    clues = _split_strings(sections[2], entry_count)
+    category_ids = bytes(sections[3])
+    if len(category_ids) != entry_count or (category_ids and max(category_ids) >= category_count):
+        raise ValueError("Corpus artifact category ids are inconsistent")
+
+    width = _row_width(entry_count)
+    try:
+        rows = zlib.decompress(sections[6])
+    except zlib.error as error:
+        raise ValueError(f"Corpus artifact index is corrupt: {error}") from None
+    from_bytes = int.from_bytes
+    masks = [from_bytes(rows[start : start + width], "little") for start in range(0, len(rows), width)]
+
+    buckets = _read_array(sections[4])
+    by_length: Dict[int, Tuple[int, ...]] = {}
+    position = 0
+    while position < len(buckets):
+        if position + 2 > len(buckets) or position + 2 + buckets[position + 1] > len(buckets):
+            raise ValueError("Corpus artifact length buckets are truncated")
+        length, count = buckets[position], buckets[position + 1]
+        by_length[length] = tuple(buckets[position + 2 : position + 2 + count])
+        position += 2 + count
+
+    keys = _read_array(sections[5])
+    if len(keys) % 3 or len(masks) != len(by_length) + len(keys) // 3:
+        raise ValueError("Corpus artifact letter index does not match its bitsets")
+    length_masks = dict(zip(by_length, masks))
+    letters = map(chr, keys[2::3])
+    positional: Dict[PositionalKey, int] = dict(zip(zip(keys[0::3], keys[1::3], letters), masks[len(by_length) :]))
+
+    return ArtifactTables(
+        digest.hex(), words, clues, categories, category_ids, by_length, length_masks, positional
+    )
+
+
+def _row_width(entry_count: int) -> int:
+    return max(1, (entry_count + 7) // 8)
+
+
+def _join_strings(values: Sequence[str]) -> bytes:
+    for value in values:
+        if "\n" in value:
+            raise ValueError(f"Corpus strings may not contain newlines: {value!r}")
+    return "\n".join(values).encode("utf-8")
+
+
+def _split_strings(section: memoryview, count: int) -> List[str]:
+    if count == 0:
+        return []
+    values = bytes(section).decode("utf-8").split("\n")
+    if len(values) != count:
+        raise ValueError(f"Corpus artifact has {len(values)} strings in a section, expected {count}")
+    return values
+
+
+def _array_bytes(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_array(section: memoryview) -> array:
+    values = array("I")
+    if len(section) % values.itemsize:
+        raise ValueError("Corpus artifact table is truncated")
+    values.frombytes(section)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from .puzzle_search import ATTEMPTS_PER_SIZE, MIN_WORD_LENGTH, Attempt
+from .wordlist import WordCorpus
+
+# Fitted against measured hit rates of the default generator on the shipped word list
+# (all difficulty combinations, 10-30 words, 15x15-23x23). A square grid of side n holds roughly
+# n^2 / L^CAPACITY_EXPONENT words, where L is the weighted mean word length with short words
+# favoured (each word weighted by 1 / length^2, as short words are much easier to attach).
+CAPACITY_EXPONENT = 1.3
+# Probability of one attempt hitting the target is logistic in capacity / target.
+HIT_MIDPOINT = 0.98
+HIT_SCALE = 0.065
+# Sizes below this per-attempt hit probability are skipped outright.
+SKIP_PROBABILITY = 0.05
+# Attempts are budgeted so a size is abandoned once it had this chance of producing a hit.
+TARGET_CONFIDENCE = 0.99
+MIN_ATTEMPTS_PER_SIZE = 10
+# Chance that two random letters of English words match; word lists with more evenly spread
+# letters cross less often and get their capacity scaled down.
+REFERENCE_COINCIDENCE = 0.06
+
+
+@dataclass(frozen=True)
+class SizeEstimate:
+    """Prediction for one grid size; `attempts` is how many attempts the search should spend on it."""
+
+    size: int
+    usable_words: int
+    effective_length: float
+    capacity: float
+    hit_probability: float
+    attempts: int
+
+    @property
+    def skipped(self) -> bool:
+        return self.attempts == 0
+
+    def describe(self) -> str:
+        if self.skipped:
+            return f"{self.size}: p={self.hit_probability:.2f} skip"
+        return f"{self.size}: p={self.hit_probability:.2f} x{self.attempts}"
+
+
+def letter_coincidence(corpus: WordCorpus) -> float:
+    """Probability that two letters drawn at random from the corpus words are the same."""
+    counts = Counter("".join(entry.word for entry in corpus))
+    total = sum(counts.values())
+    if not total:
+        return 0.0
+    return sum((count / total) ** 2 for count in counts.values())
+
+
+def estimate_sizes(
+    corpus: WordCorpus,
+    target: int,
+    sizes: Sequence[int],
+    category_weights: Dict[str, float],
+    attempts_per_size: int = ATTEMPTS_PER_SIZE,
+    min_length: int = MIN_WORD_LENGTH,
+) -> List[SizeEstimate]:
+    """Predict, for each square grid size, how likely one attempt is to place exactly `target` words."""
+    default_weight = max(float(category_weights.get("_default", 1.0)), 0.0)
+    crossing = min(1.0, letter_coincidence(corpus) / REFERENCE_COINCIDENCE) ** 0.5
+    estimates: List[SizeEstimate] = []
+    for size in sizes:
+        usable = 0
+        weighted_length = 0.0
+        total_weight = 0.0
+        for entry in corpus:
+            length = len(entry.word)
+            if length < min_length or length > size:
+                continue
+            weight = max(float(category_weights.get(entry.category, default_weight)), 0.0)
+            if weight <= 0.0:
+                continue
+            usable += 1
+            weight /= length * length
+            weighted_length += weight * length
+            total_weight += weight
+
+        if usable < target or total_weight <= 0.0:
+            estimates.append(SizeEstimate(size, usable, 0.0, 0.0, 0.0, 0))
+            continue
+        effective_length = weighted_length / total_weight
+        capacity = crossing * size * size / math.pow(effective_length, CAPACITY_EXPONENT)
+        probability = 1.0 / (1.0 + math.exp(-(capacity / target - HIT_MIDPOINT) / HIT_SCALE))
+        estimates.append(
+            SizeEstimate(
+                size,
+                usable,
+                effective_length,
+                capacity,
+                probability,
+                _attempt_budget(probability, attempts_per_size),
+            )
+        )
+    return estimates
+
+
+def prune_attempts(attempts: Sequence[Attempt], estimates: Sequence[SizeEstimate]) -> List[Attempt]:
+    """
+    Drop attempts on sizes predicted to be hopeless and trim each size to its attempt budget.
+
+    The plan keeps its order and seeds, so a size that is kept runs exactly the attempts it would
+    have run anyway. If every size would be dropped the full plan is returned, so the search can
+    still fall back to its closest layout.
+
+    Pruning does change the search's outcome: a seed whose unpruned plan would have hit on a
+    dropped attempt gets a different puzzle, and if every kept attempt misses, the search settles
+    for its closest layout where the full plan might still have reached the target, leaving that
+    world with fewer words (and so fewer locations).
+    """
+    budgets: Dict[int, int] = {estimate.size: estimate.attempts for estimate in estimates}
+    used: Dict[int, int] = {}
+    pruned: List[Attempt] = []
+    for size, seed in attempts:
+        count = used.get(size, 0)
+        if count >= budgets.get(size, count + 1):
+            continue
+        used[size] = count + 1
+        pruned.append((size, seed))
+    return pruned or list(attempts)
+
+
+def describe_estimates(estimates: Sequence[SizeEstimate], hit_size: Optional[int] = None) -> str:
+    summary = ", ".join(estimate.describe() for estimate in estimates)
+    if hit_size is None:
+        return summary
+    return f"{summary}; hit on {hit_size}"
+
+
+def _attempt_budget(probability: float, attempts_per_size: int) -> int:
+    if probability < SKIP_PROBABILITY:
+        return 0
+    if probability >= 1.0:
+        return min(MIN_ATTEMPTS_PER_SIZE, attempts_per_size)
+    needed = math.ceil(math.log(1.0 - TARGET_CONFIDENCE) / math.log(1.0 - probability))
+    return max(min(needed, attempts_per_size), min(MIN_ATTEMPTS_PER_SIZE, attempts_per_size))
@@ -0,0 +1,168 @@
+"""
+Optional on-disk cache of searched layouts, so regenerating the same multiworld skips the search.
+
+A cache entry is keyed by everything that decides which layout a search returns: the generator
+version, the word list hash and the whole SearchRequest (categories, target, weights, engine,
+placement policy and the attempt plan, which carries the seeds drawn from the world RNG). Entries
+are JSON files named after the key; reading one refreshes its modification time and the oldest
+files are evicted once the directory grows past its size limit.
+
+Searches cut short by a time limit are never stored, as a later search could go further. Cache
+problems (unreadable directory, corrupt entry) are logged and treated as a miss.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .puzzle_generator import GENERATOR_VERSION, PuzzleLayout
+from .puzzle_search import SOURCE_CACHE, SearchRequest, SearchResult, search_layouts
+from .wordlist import get_word_corpus
+
+ENTRY_SUFFIX = ".json"
+
+
+class LayoutCache:
+    def __init__(self, directory: os.PathLike, max_bytes: int, verify: bool = False) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        # Search anyway on a hit and compare, to check the cache against the current generator.
+        self.verify = verify
+
+    def key(self, request: SearchRequest, corpus_hash: str) -> str:
+        payload = {
+            "generator_version": GENERATOR_VERSION,
+            "corpus": corpus_hash,
+            "excluded_categories": sorted(request.excluded_categories),
+            "target": request.target,
+            "attempts": request.attempts,
+            "category_weights": sorted(request.category_weights.items()),
+            "engine": request.engine,
+            "backtrack": None if request.backtrack is None else dataclasses.asdict(request.backtrack),
+            "placement": request.placement,
+            # request.scorer is left out: both scorers give the same layouts.
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> Optional[SearchResult]:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_bytes())
+            result = _result_from_record(data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            logging.warning(f"CrosswordAP: ignoring unreadable layout cache entry {path}: {error}")
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def store(self, key: str, result: SearchResult) -> None:
+        if result.degraded:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write and rename, so a concurrent reader never sees half an entry.
+            handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(handle, "wb") as stream:
+                    stream.write(encode_record(result))
+                os.replace(temporary, self._path(key))
+            except BaseException:
+                os.unlink(temporary)
+                raise
+            self._evict()
+        except OSError as error:
+            logging.warning(f"CrosswordAP: could not write to the layout cache {self.directory}: {error}")
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*" + ENTRY_SUFFIX):
+            try:
+                status = path.stat()
+            except OSError:
+                continue
+            entries.append((status.st_mtime, status.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (key + ENTRY_SUFFIX)
+
+
+def encode_record(result: SearchResult) -> bytes:
+    """
+    Bytes of a search result; a cache hit and a fresh search must match exactly. Keys keep their
+    order (the layout's is the one slot data is pickled with), so verify also catches a cached
+    layout whose entries would serialize differently.
+    """
+    record = {
+        "generator_version": GENERATOR_VERSION,
+        "seed": result.seed,
+        "exact": result.exact,
+        "attempt": result.attempt,
+        "size": result.size,
+        "layout": result.layout.as_dict(),
+    }
+    return json.dumps(record, separators=(",", ":")).encode("utf-8")
+
+
+def _result_from_record(data: Dict[str, Any]) -> SearchResult:
+    if data.get("generator_version") != GENERATOR_VERSION:
+        raise ValueError(f"written by generator version {data.get('generator_version')!r}")
+    return SearchResult(
+        PuzzleLayout.from_dict(data["layout"]),
+        int(data["seed"]),
+        bool(data["exact"]),
+        int(data["attempt"]),
+        int(data["size"]),
+        source=SOURCE_CACHE,
+    )
+
+
+def search_layouts_cached(
+    requests: Sequence[SearchRequest],
+    cache: Optional[LayoutCache],
+    workers: int = 0,
+    time_budget: Optional[float] = None,
+) -> List[Optional[SearchResult]]:
+    """search_layouts, answering what it can from the cache and storing what it had to search."""
+    if cache is None:
+        return search_layouts(requests, workers, time_budget)
+    corpus_hash = get_word_corpus().source_hash
+    keys = [cache.key(request, corpus_hash) for request in requests]
+    results: List[Optional[SearchResult]] = [cache.load(key) for key in keys]
+    pending = [index for index, result in enumerate(results) if result is None or cache.verify]
+    if not pending:
+        return results
+
+    searched = search_layouts([requests[index] for index in pending], workers, time_budget)
+    for index, fresh in zip(pending, searched):
+        cached = results[index]
+        if fresh is None or (cached is not None and fresh.degraded):
+            # A search cut short proves nothing about the entry; keep using it.
+            continue
+        results[index] = fresh
+        if cached is not None:
+            if encode_record(cached) == encode_record(fresh):
+                continue
+            logging.warning(f"CrosswordAP: layout cache entry {keys[index]} differs from a fresh search; replacing it")
+        cache.store(keys[index], fresh)
+    return results
@@ -0,0 +1,120 @@
+"""
+Pre-generated layout pools (built with tools/build_layout_pool.py), so a slot can draw a layout
+instead of searching for one.
+
+A pool file is zlib-compressed JSON holding, per (total words, excluded categories) combination, a
+list of exact layouts in the compact slot data format with the seed, grid size and generator
+version that produced each. Opening a pool decompresses and parses the whole file, once per
+process (load_layout_pool keeps it until the file changes); only turning the drawn record into a
+PuzzleLayout waits for draw.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .puzzle_generator import GENERATOR_VERSION, PuzzleLayout
+from .puzzle_search import SOURCE_POOL, SearchResult
+
+POOL_FORMAT_VERSION = 1
+
+
+def pool_key(target: int, excluded_categories: Iterable[str]) -> str:
+    """Pool name for a word count and set of disabled categories, e.g. "20:HARD WORDS"."""
+    return f"{target}:{','.join(sorted(excluded_categories))}"
+
+
+class LayoutPool:
+    def __init__(
+        self,
+        pools: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        corpus_hash: str = "",
+        generator_version: int = GENERATOR_VERSION,
+    ) -> None:
+        self.pools: Dict[str, List[Dict[str, Any]]] = pools if pools is not None else {}
+        # Informational: pooled layouts carry their own words and clues, so they stay usable after
+        # the word list or generator changes.
+        self.corpus_hash = corpus_hash
+        # The generator of records that do not name their own: pools written before records carried
+        # one. A pool appended to by a newer generator holds layouts from both.
+        self.generator_version = generator_version
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self.pools.values())
+
+    def count(self, key: str) -> int:
+        return len(self.pools.get(key, ()))
+
+    def add(self, key: str, result: SearchResult) -> None:
+        self.pools.setdefault(key, []).append(
+            {
+                "seed": result.seed,
+                "size": result.size,
+                "generator_version": result.generator_version,
+                "layout": result.layout.as_compact_dict(),
+            }
+        )
+
+    def draw(self, key: str, rng: random.Random) -> Optional[SearchResult]:
+        """A layout from the key's pool picked with rng, or None if the pool has none for it."""
+        records = self.pools.get(key)
+        if not records:
+            return None
+        record = records[rng.randrange(len(records))]
+        return SearchResult(
+            PuzzleLayout.from_dict(record["layout"]),
+            int(record["seed"]),
+            True,
+            0,
+            int(record["size"]),
+            source=SOURCE_POOL,
+            generator_version=int(record.get("generator_version", self.generator_version)),
+        )
+
+    def encode(self) -> bytes:
+        document = {
+            "format": POOL_FORMAT_VERSION,
+            "generator_version": self.generator_version,
+            "corpus": self.corpus_hash,
+            "pools": dict(sorted(self.pools.items())),
+        }
+        return zlib.compress(json.dumps(document, separators=(",", ":")).encode("utf-8"), 9)
+
+    @classmethod
+    def decode(cls, data: bytes) -> LayoutPool:
+        """Read a pool file's bytes; raises ValueError if they are not a pool of this format."""
+        try:
+            document = json.loads(zlib.decompress(data))
+        except (zlib.error, UnicodeDecodeError) as error:
+            raise ValueError(f"Not a layout pool: {error}") from None
+        if not isinstance(document, dict):
+            raise ValueError("Not a layout pool")
+        if document.get("format") != POOL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported layout pool format {document.get('format')!r}")
+        pools = document.get("pools")
+        if not isinstance(pools, dict) or not all(isinstance(records, list) for records in pools.values()):
+            raise ValueError("Layout pool has no valid pools table")
+        return cls(pools, str(document.get("corpus", "")), int(document.get("generator_version", 0)))
+
+
+_pools: Dict[str, Tuple[float, LayoutPool]] = {}
+_pools_lock = threading.Lock()
+
+
+def load_layout_pool(path: str) -> LayoutPool:
+    """The pool at path, read once per process and again only if the file changes."""
+    path = os.path.abspath(path)
+    modified = os.path.getmtime(path)
+    with _pools_lock:
+        cached = _pools.get(path)
+        if cached is not None and cached[0] == modified:
+            return cached[1]
+        with open(path, "rb") as stream:
+            pool = LayoutPool.decode(stream.read())
+        _pools[path] = (modified, pool)
+        return pool
@@ -72,6 +72,57 @@ class IncludeHardWords(Toggle):
     default = 0
 
 
+class CompactLayout(Toggle):
+    """Send the puzzle layout to the client in the compact format, which makes the multidata and
+    the data sent on connect smaller. Requires a client that understands it."""
+    display_name = "Compact Layout"
+    default = 0
+
+
+class IncludeGenerationStats(Toggle):
+    """Include puzzle generation counters and timings in the slot data.
+    Meant for debugging slow generations; the timings differ between otherwise identical runs."""
+    display_name = "Include Generation Stats"
+    default = 0
+
+
+class GenerationTimeLimit(Range):
+    """Seconds the generator may spend searching for this player's puzzle; 0 for no limit.
+    When the limit runs out the closest puzzle found so far is used, which may have fewer words than
+    requested, and the same seed may then produce a different puzzle on a faster or slower machine."""
+    display_name = "Generation Time Limit"
+    range_start = 0
+    range_end = 600
+    default = 0
+
+
+class PlacementPolicy(Choice):
+    """How the generator picks where each word goes.
+    first: The first spot that fits, as in earlier versions.
+    best: The spot with the most crossings and least growth, for slightly denser grids.
+    Changing this changes the puzzle a seed produces."""
+    display_name = "Placement Policy"
+    option_first = 0
+    option_best = 1
+    default = 0
+
+
+class UseLayoutPool(Toggle):
+    """Draw the puzzle from the host's pre-generated layout pool instead of searching for one, which
+    makes generation much faster. Falls back to a search if the host has no pooled puzzles for
+    these options."""
+    display_name = "Use Layout Pool"
+    default = 0
+
+
+class UsePuzzleCatalog(Toggle):
+    """Play a published puzzle from the host's .puz catalog instead of a generated one. The puzzle
+    has the word count closest to Total Words, and the difficulty toggles do not apply. Falls back
+    to a generated puzzle if the host has no catalog."""
+    display_name = "Use Puzzle Catalog"
+    default = 0
+
+
 option_groups = [
     OptionGroup("Crossword Setup", [
         TotalWords,
@@ -87,6 +138,14 @@ option_groups = [
         LetterHintsEnabled,
         StartingLetterHints,
     ]),
+    OptionGroup("Advanced", [
+        CompactLayout,
+        IncludeGenerationStats,
+        GenerationTimeLimit,
+        PlacementPolicy,
+        UseLayoutPool,
+        UsePuzzleCatalog,
+    ], start_collapsed=True),
 ]
 
 
@@ -102,6 +161,12 @@ class CrosswordOptions(PerGameCommonOptions):
     include_easy_words: IncludeEasyWords
     include_medium_words: IncludeMediumWords
     include_hard_words: IncludeHardWords
+    compact_layout: CompactLayout
+    include_generation_stats: IncludeGenerationStats
+    generation_time_limit: GenerationTimeLimit
+    placement_policy: PlacementPolicy
+    use_layout_pool: UseLayoutPool
+    use_puzzle_catalog: UsePuzzleCatalog
     
     def __post_init__(self):
         if not (self.include_easy_words.value or self.include_medium_words.value or self.include_hard_words.value):
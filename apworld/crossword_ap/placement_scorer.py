@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .board import CrosswordBoard
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:  # NumPy is optional; the pure-Python scorer in the generator is the reference.
+    np = None
+
+SCORER_PYTHON = "python"
+SCORER_NUMPY = "numpy"
+SCORERS = (SCORER_PYTHON, SCORER_NUMPY)
+
+
+class ScoredPlacement(NamedTuple):
+    """A legal placement of a word and how many existing letters it crosses."""
+
+    crossings: int
+    row: int
+    col: int
+    across: bool
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def rank_placements(placements: Iterable[ScoredPlacement]) -> List[ScoredPlacement]:
+    """Most crossings first, then top-to-bottom, left-to-right, across before down."""
+    return sorted(
+        placements,
+        key=lambda placement: (-placement.crossings, placement.row, placement.col, not placement.across),
+    )
+
+
+class NumpyPlacementScorer:
+    """
+    Vectorized scorer: every start cell on the board is evaluated in a handful of array operations.
+
+    Accepts exactly the placements CrosswordPuzzleGenerator._can_place_horizontal/_vertical accept
+    (tools/check_placement_parity.py compares the two). Everything except the letter match depends
+    only on the board and the word length, so it is computed once per board revision and length;
+    scoring a word then only compares its letters against the surviving start cells.
+    """
+
+    def __init__(self) -> None:
+        if np is None:
+            raise ValueError("The numpy placement scorer needs NumPy installed")
+        self._board: Optional[CrosswordBoard] = None
+        self._revision = -1
+        self._tables: Dict[int, List[_LineTable]] = {}
+
+    def placements(self, word: str, board: CrosswordBoard) -> List[ScoredPlacement]:
+        """Every legal placement of word on the board, ranked."""
+        if board is not self._board or board.revision != self._revision:
+            self._board = board
+            self._revision = board.revision
+            self._tables.clear()
+        tables = self._tables.get(len(word))
+        if tables is None:
+            tables = self._tables[len(word)] = _line_tables(board, len(word))
+
+        codes = np.array(board.encode(word), dtype=np.uint8)
+        placements: List[ScoredPlacement] = []
+        for across, lines, offsets, windows, crossings in tables:
+            if not len(lines):
+                continue
+            matches = ~np.any((windows != 0) & (windows != codes), axis=1)
+            for line, offset, count in zip(
+                lines[matches].tolist(), offsets[matches].tolist(), crossings[matches].tolist()
+            ):
+                if across:
+                    placements.append(ScoredPlacement(count, line, offset, True))
+                else:
+                    placements.append(ScoredPlacement(count, offset, line, False))
+        return rank_placements(placements)
+
+
+# (across, line numbers, start offsets, letters under each candidate, crossings) for the start
+# cells that pass every check except the letter match.
+_LineTable = Tuple[bool, Any, Any, Any, Any]
+
+
+def _line_tables(board: CrosswordBoard, length: int) -> List[_LineTable]:
+    rows = board.rows
+    cols = board.cols
+    cells = np.frombuffer(board.cells, dtype=np.uint8).reshape(rows, cols)
+    across = np.frombuffer(board.across, dtype=np.uint8).reshape(rows, cols)
+    down = np.frombuffer(board.down, dtype=np.uint8).reshape(rows, cols)
+    # Down placements are across placements on the transposed board.
+    return [
+        (True, *_scan_lines(cells, across, down, length)),
+        (False, *_scan_lines(cells.T, down.T, across.T, length)),
+    ]
+
+
+def _scan_lines(cells, same, crossing, length: int) -> Tuple[Any, Any, Any, Any]:
+    """Candidate starts along the rows of the given arrays, before looking at the word's letters."""
+    width = cells.shape[1]
+    if length == 0 or length > width:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty, np.zeros((0, length), dtype=np.uint8), empty
+    starts = width - length + 1
+    occupied = cells != 0
+    # Cells with a letter directly beside them, across the direction of the word.
+    beside = np.zeros_like(occupied)
+    beside[1:] |= occupied[:-1]
+    beside[:-1] |= occupied[1:]
+
+    window = sliding_window_view(cells, length, axis=1)
+    filled = window != 0
+    # A cell already covered in this direction, or a letter not belonging to a crossing word.
+    legal = ~np.any(sliding_window_view(same, length, axis=1) != 0, axis=2)
+    legal &= ~np.any(filled & (sliding_window_view(crossing, length, axis=1) == 0), axis=2)
+    legal &= ~np.any(~filled & sliding_window_view(beside, length, axis=1), axis=2)
+    crossings = filled.sum(axis=2)
+    legal &= crossings > 0
+    # The cells just before and after the word must be empty.
+    legal[:, 1:] &= ~occupied[:, : starts - 1]
+    legal[:, : starts - 1] &= ~occupied[:, length:]
+
+    lines, offsets = np.nonzero(legal)
+    return lines, offsets, window[lines, offsets], crossings[lines, offsets]
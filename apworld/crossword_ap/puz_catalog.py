@@ -0,0 +1,254 @@
+"""
+Catalog of a local .puz archive (built with tools/ingest_puz.py), so puzzles that fit CrosswordAP
+can be found without parsing the archive again.
+
+The catalog is a SQLite file with one row per .puz file: its path, size and modification time, a
+content hash, the grid size, word and clue counts, title and author, and whether
+validate_puzzle_for_apworld accepted it (with its reason if not). Files are parsed and validated
+across a process pool; re-ingesting a directory only re-reads files whose size or modification time
+changed and drops rows for files that are gone.
+
+layout_from_puz turns a catalog puzzle into a PuzzleLayout, so a world can play a published grid
+instead of searching for one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import astuple, dataclass, fields
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .puz_parser import PuzParseError, PuzPuzzle, parse_puz_bytes, validate_puzzle_for_apworld
+from .puzzle_generator import BLOCK, DIR_ACROSS, DIR_DOWN, EntryDict, PuzzleLayout
+
+# Bumped when validate_puzzle_for_apworld gets stricter, so old catalogs are rebuilt rather than trusted.
+CATALOG_FORMAT_VERSION = 2
+PUZ_SUFFIX = ".puz"
+# Files handed to a worker process at a time; parsing one takes well under a millisecond.
+CHUNK_SIZE = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS puzzles (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    content_hash TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    word_count INTEGER NOT NULL,
+    clue_count INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    valid INTEGER NOT NULL,
+    reason TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS puzzles_fit ON puzzles (valid, word_count, width, height);
+CREATE INDEX IF NOT EXISTS puzzles_hash ON puzzles (content_hash);
+"""
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    path: str
+    size: int
+    mtime: float
+    content_hash: str
+    # Zero for files that could not be parsed.
+    width: int
+    height: int
+    word_count: int
+    clue_count: int
+    title: str
+    author: str
+    valid: bool
+    # Why the file was rejected; empty for valid puzzles.
+    reason: str
+
+
+_COLUMNS = ", ".join(field.name for field in fields(CatalogEntry))
+
+
+def inspect_puz_file(path: str) -> CatalogEntry:
+    """Parse and validate one .puz file into its catalog row; unreadable or corrupt files become invalid rows."""
+    try:
+        status = os.stat(path)
+        with open(path, "rb") as stream:
+            data = stream.read()
+    except OSError as error:
+        return CatalogEntry(path, 0, 0.0, "", 0, 0, 0, 0, "", "", False, f"Cannot read file: {error}")
+    content_hash = hashlib.sha256(data).hexdigest()
+    try:
+        puzzle = parse_puz_bytes(data)
+    except PuzParseError as error:
+        return CatalogEntry(
+            path, status.st_size, status.st_mtime, content_hash, 0, 0, 0, 0, "", "", False, str(error)
+        )
+    valid, reason = validate_puzzle_for_apworld(puzzle)
+    return CatalogEntry(
+        path,
+        status.st_size,
+        status.st_mtime,
+        content_hash,
+        puzzle.width,
+        puzzle.height,
+        puzzle.word_count,
+        len(puzzle.clues),
+        puzzle.title,
+        puzzle.author,
+        valid,
+        reason or "",
+    )
+
+
+def find_puz_files(directory: os.PathLike) -> List[str]:
+    """Every .puz file under directory, sorted, as absolute paths."""
+    found = []
+    for root, _, names in os.walk(os.path.abspath(directory)):
+        found.extend(os.path.join(root, name) for name in names if name.lower().endswith(PUZ_SUFFIX))
+    return sorted(found)
+
+
+class PuzCatalog:
+    def __init__(self, path: os.PathLike, read_only: bool = False) -> None:
+        """
+        Open (or, unless read_only, create) the catalog at path; raises ValueError if it is not a
+        usable catalog.
+        """
+        self.path = Path(path)
+        try:
+            if read_only:
+                self.connection = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+            else:
+                self.connection = sqlite3.connect(str(self.path))
+                with self.connection:
+                    self.connection.executescript(_SCHEMA)
+                    self.connection.execute(
+                        "INSERT OR IGNORE INTO meta VALUES ('format', ?)", (str(CATALOG_FORMAT_VERSION),)
+                    )
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+        except sqlite3.Error as error:
+            raise ValueError(f"Not a puzzle catalog: {error}") from None
+        if row is None or row[0] != str(CATALOG_FORMAT_VERSION):
+            self.connection.close()
+            raise ValueError(f"Unsupported puzzle catalog format {row and row[0]!r}; rebuild {self.path}")
+
+    def __enter__(self) -> PuzCatalog:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM puzzles").fetchone()[0]
+
+    def ingest(self, directory: os.PathLike, workers: int = 0) -> Tuple[int, int]:
+        """
+        Bring the rows for every .puz file under directory up to date.
+
+        Returns how many files were (re)parsed and how many rows were removed because their file is
+        gone or can no longer be read. With workers > 1 files are parsed in that many processes.
+        """
+        paths = find_puz_files(directory)
+        root = os.path.join(os.path.abspath(directory), "")
+        known: Dict[str, Tuple[int, float]] = {
+            path: (size, mtime)
+            for path, size, mtime in self.connection.execute("SELECT path, size, mtime FROM puzzles")
+            if path.startswith(root)
+        }
+        stale = []
+        present = set()
+        for path in paths:
+            try:
+                status = os.stat(path)
+            except OSError:
+                # Gone or unreadable since the walk: drop its row like any other missing file.
+                continue
+            present.add(path)
+            if known.get(path) != (status.st_size, status.st_mtime):
+                stale.append(path)
+        removed = sorted(set(known) - present)
+
+        with self.connection:
+            self.connection.executemany("DELETE FROM puzzles WHERE path = ?", ((path,) for path in removed))
+            self._insert(_inspect_all(stale, workers))
+        return len(stale), len(removed)
+
+    def _insert(self, entries: Iterable[CatalogEntry]) -> None:
+        placeholders = ", ".join("?" for _ in fields(CatalogEntry))
+        self.connection.executemany(
+            f"INSERT OR REPLACE INTO puzzles ({_COLUMNS}) VALUES ({placeholders})",
+            (astuple(entry) for entry in entries),
+        )
+
+    def find(
+        self,
+        word_count: Optional[int] = None,
+        max_width: int = 21,
+        max_height: int = 21,
+    ) -> List[CatalogEntry]:
+        """
+        Valid puzzles within the size limits (and with exactly word_count words if given), one per
+        distinct content, by path.
+        """
+        query = f"SELECT {_COLUMNS} FROM puzzles WHERE valid = 1 AND width <= ? AND height <= ?"
+        parameters: List[object] = [max_width, max_height]
+        if word_count is not None:
+            query += " AND word_count = ?"
+            parameters.append(word_count)
+        seen = set()
+        found = []
+        for entry in self._entries(query + " ORDER BY path", parameters):
+            if entry.content_hash not in seen:
+                seen.add(entry.content_hash)
+                found.append(entry)
+        return found
+
+    def word_counts(self) -> List[int]:
+        """The word counts that valid puzzles in the catalog have, ascending."""
+        query = "SELECT DISTINCT word_count FROM puzzles WHERE valid = 1 ORDER BY word_count"
+        return [count for count, in self.connection.execute(query)]
+
+    def entries(self) -> List[CatalogEntry]:
+        return list(self._entries(f"SELECT {_COLUMNS} FROM puzzles ORDER BY path", ()))
+
+    def _entries(self, query: str, parameters: Iterable[object]) -> Iterator[CatalogEntry]:
+        for row in self.connection.execute(query, tuple(parameters)):
+            yield CatalogEntry(*row[:10], bool(row[10]), row[11])
+
+
+def layout_from_puz(puzzle: PuzPuzzle) -> PuzzleLayout:
+    """
+    The puzzle's grid and clues as a PuzzleLayout, entries in clue order.
+
+    Rebus cells keep only the first letter of their answer, which is what the solution grid stores.
+    """
+    board = [[BLOCK if cell == "." else cell.upper() for cell in row] for row in puzzle.get_grid()]
+    mask = ["".join(BLOCK if cell == BLOCK else "." for cell in row) for row in board]
+    entries: List[EntryDict] = [
+        {
+            "word": entry.answer.upper(),
+            "clue": entry.clue,
+            "category": "",
+            "direction": DIR_ACROSS if entry.direction == "across" else DIR_DOWN,
+            "start": [entry.row, entry.col],
+            "location_index": index,
+        }
+        for index, entry in enumerate(puzzle.entries, start=1)
+    ]
+    return PuzzleLayout(board, mask, entries)
+
+
+def _inspect_all(paths: List[str], workers: int) -> Iterator[CatalogEntry]:
+    if workers <= 1 or len(paths) < CHUNK_SIZE:
+        yield from map(inspect_puz_file, paths)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(inspect_puz_file, paths, chunksize=CHUNK_SIZE)
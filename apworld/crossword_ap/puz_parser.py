@@ -3,8 +3,39 @@ Minimal .puz file parser for CrosswordAP
 Based on .puz format specification: https://code.google.com/archive/p/puz/wikis/FileFormat.wiki
 """
 
+import mmap
+import re
 import struct
-from typing import Tuple, List, Dict, Optional
+from typing import Tuple, List, Dict, Iterable, Iterator, NamedTuple, Optional
+
+# Header: overall checksum, magic, CIB checksum, masked low/high checksums, version, reserved,
+# scrambled checksum, reserved, width, height, clue count, puzzle type, scrambled state.
+HEADER = struct.Struct("<H12sH4s4s4s2sH12sBBHHH")
+MAGIC = b"ACROSS&DOWN\0"
+# The CIB checksum covers the header from the width byte to the end (8 bytes).
+CIB_OFFSET = 0x2C
+CIB_LENGTH = 8
+MASK = b"ICHEATED"
+SCRAMBLED = 0x0004
+
+# Extension sections, each stored as title, length, checksum, data and a NUL byte.
+SECTION = struct.Struct("<4sHH")
+GEXT_PREVIOUSLY_INCORRECT = 0x10
+GEXT_INCORRECT = 0x20
+GEXT_REVEALED = 0x40
+GEXT_CIRCLED = 0x80
+
+WORD_RUN = re.compile(r"[^.]{2,}")
+# What the CrosswordAP client can play: letter cells, and entries of at least three of them
+# (scripts/grid_manager.gd drops shorter ones).
+_NON_LETTER_CELL = re.compile(r"[^A-Za-z.]")
+MIN_ENTRY_LENGTH = 3
+
+# Archive of concatenated .puz files: magic, file count and table offset, the files, then a table
+# with each file's offset and length.
+ARCHIVE_MAGIC = b"PUZARCv1"
+ARCHIVE_HEADER = struct.Struct("<8sIQ")
+ARCHIVE_ENTRY = struct.Struct("<QI")
 
 
 class PuzParseError(Exception):
@@ -12,20 +43,63 @@ class PuzParseError(Exception):
     pass
 
 
+class PuzChecksumError(PuzParseError):
+    """Raised when a .puz file's contents do not match its checksums (corrupt or edited file)"""
+    pass
+
+
+class PuzEntry(NamedTuple):
+    """One numbered word of a puzzle"""
+    number: int
+    direction: str  # "across" or "down"
+    row: int
+    col: int
+    answer: str  # Solution letters; rebus cells hold only their first letter
+    clue: str
+
+    @property
+    def length(self) -> int:
+        return len(self.answer)
+
+
+class PuzHeader(NamedTuple):
+    """The fixed header at the start of every .puz file"""
+    checksum: int
+    cib_checksum: int
+    masked_low: bytes
+    masked_high: bytes
+    version: str
+    width: int
+    height: int
+    clue_count: int
+    puzzle_type: int
+    scrambled: bool
+
+
 class PuzPuzzle:
     """Represents a parsed crossword puzzle from a .puz file"""
-    
+
     def __init__(self):
         self.width: int = 0
         self.height: int = 0
-        self.solution: List[str] = []  # Grid solution (with black squares as '.')
-        self.fill: List[str] = []  # Player fill (usually empty, '-' for empty cells)
+        self.solution: str = ""  # Grid solution, row-major (with black squares as '.')
+        self.fill: str = ""  # Player fill (usually empty, '-' for empty cells)
         self.title: str = ""
         self.author: str = ""
         self.copyright: str = ""
-        self.clues: List[str] = []  # All clues in order (across then down)
+        self.clues: List[str] = []  # All clues in number order (across before down at the same number)
         self.notes: str = ""
-        
+        self.version: str = "1.3"
+        self.puzzle_type: int = 0x0001
+        self.scrambled: bool = False
+        # Extension sections by title, raw; the known ones are also decoded below.
+        self.extensions: Dict[str, bytes] = {}
+        self.rebus: Dict[int, str] = {}  # Cell index -> full answer, from GRBS + RTBL
+        self.markup: Optional[bytes] = None  # GEXT flags per cell (GEXT_* bits)
+        self.timer: Optional[Tuple[int, bool]] = None  # LTIM: (elapsed seconds, stopped)
+        self._entries: Optional[List[PuzEntry]] = None
+        self._entries_key: Tuple = ()
+
     def get_grid(self) -> List[List[str]]:
         """Convert solution string to 2D grid"""
         grid = []
@@ -34,187 +108,546 @@ class PuzPuzzle:
             end = start + self.width
             grid.append(list(self.solution[start:end]))
         return grid
-    
+
+    @property
+    def entries(self) -> List[PuzEntry]:
+        """
+        Every word in clue order, numbered, with its answer and clue.
+
+        Computed in one scan of the solution and cached until the solution, size or clues change.
+        """
+        key = (self.width, self.height, self.solution, tuple(self.clues))
+        if self._entries is None or self._entries_key != key:
+            self._entries = self._scan_entries()
+            self._entries_key = key
+        return self._entries
+
+    @property
+    def word_count(self) -> int:
+        """Number of words in the grid, counted without numbering or assigning clues."""
+        if self._entries is not None and self._entries_key[:3] == (self.width, self.height, self.solution):
+            return len(self._entries)
+        width = self.width
+        solution = self.solution[:width * self.height]
+        rows = [solution[start:start + width] for start in range(0, len(solution), width)]
+        columns = [solution[col::width] for col in range(width)]
+        # A word is any run of two or more letters between blocks
+        return len(WORD_RUN.findall('.'.join(rows))) + len(WORD_RUN.findall('.'.join(columns)))
+
     def get_clue_map(self) -> Dict[str, List[Tuple[int, str]]]:
         """
         Returns clues organized by direction.
         Format: {"across": [(number, clue), ...], "down": [(number, clue), ...]}
         """
-        grid = self.get_grid()
-        numbering = self._get_numbering(grid)
-        
-        across_clues = []
-        down_clues = []
-        clue_idx = 0
-        
-        # Process in standard order: across first, then down
-        for direction in ["across", "down"]:
-            for number, positions in sorted(numbering.items()):
-                if direction in positions:
-                    clue = self.clues[clue_idx] if clue_idx < len(self.clues) else ""
-                    if direction == "across":
-                        across_clues.append((number, clue))
-                    else:
-                        down_clues.append((number, clue))
-                    clue_idx += 1
-        
-        return {
-            "across": across_clues,
-            "down": down_clues
-        }
-    
-    def _get_numbering(self, grid: List[List[str]]) -> Dict[int, Dict[str, Tuple[int, int]]]:
-        """
-        Calculate clue numbering based on grid.
-        Returns: {clue_number: {"across": (row, col), "down": (row, col)}}
-        """
-        numbering = {}
-        current_number = 1
-        
-        for r in range(self.height):
-            for c in range(self.width):
-                if grid[r][c] == '.':  # Black square
-                    continue
-                
-                # Check if this cell starts an across word
-                starts_across = (c == 0 or grid[r][c-1] == '.') and (c + 1 < self.width and grid[r][c+1] != '.')
-                
-                # Check if this cell starts a down word
-                starts_down = (r == 0 or grid[r-1][c] == '.') and (r + 1 < self.height and grid[r+1][c] != '.')
-                
-                if starts_across or starts_down:
-                    if current_number not in numbering:
-                        numbering[current_number] = {}
-                    
-                    if starts_across:
-                        numbering[current_number]["across"] = (r, c)
-                    if starts_down:
-                        numbering[current_number]["down"] = (r, c)
-                    
-                    current_number += 1
-        
-        return numbering
-
-
-def parse_puz_file(file_path: str) -> PuzPuzzle:
+        clue_map: Dict[str, List[Tuple[int, str]]] = {"across": [], "down": []}
+        for entry in self.entries:
+            clue_map[entry.direction].append((entry.number, entry.clue))
+        return clue_map
+
+    def _scan_entries(self) -> List[PuzEntry]:
+        width, height, solution, clues = self.width, self.height, self.solution, self.clues
+        # Words are the runs of two or more letters in each row and column. Joining the rows (and the
+        # columns) with a block between each lets one regex pass find them; cell (r, c) sits at
+        # r * (width + 1) + c in the joined rows and c * (height + 1) + r in the joined columns.
+        solution = solution[:width * height]
+        rows = '.'.join([solution[start:start + width] for start in range(0, len(solution), width)])
+        columns = '.'.join([solution[col::width] for col in range(width)])
+        starts: Dict[int, List[Tuple[str, str]]] = {}
+        for run in WORD_RUN.finditer(rows):
+            r, c = divmod(run.start(), width + 1)
+            starts[r * width + c] = [("across", run.group())]
+        for run in WORD_RUN.finditer(columns):
+            c, r = divmod(run.start(), height + 1)
+            # Across before down where a cell starts both
+            starts.setdefault(r * width + c, []).append(("down", run.group()))
+        # Numbers and .puz clues follow the start cells in reading order
+        entries = []
+        for number, index in enumerate(sorted(starts), start=1):
+            r, c = divmod(index, width)
+            for direction, answer in starts[index]:
+                clue = clues[len(entries)] if len(entries) < len(clues) else ""
+                entries.append(PuzEntry(number, direction, r, c, answer, clue))
+        return entries
+
+
+def puz_checksum(data: bytes, checksum: int = 0) -> int:
+    """The .puz rotate-and-add checksum of data, continuing from checksum"""
+    for byte in data:
+        checksum = ((checksum >> 1) | ((checksum & 1) << 15)) + byte & 0xFFFF
+    return checksum
+
+
+def parse_puz_file(file_path: str, verify: bool = True) -> PuzPuzzle:
     """
     Parse a .puz file and return a PuzPuzzle object.
-    
+
     Args:
         file_path: Path to the .puz file
-        
+        verify: Check the file's checksums (see parse_puz_bytes)
+
     Returns:
         PuzPuzzle object containing puzzle data
-        
+
     Raises:
         PuzParseError: If file cannot be parsed
+        PuzChecksumError: If verify is set and a checksum does not match
     """
     try:
         with open(file_path, 'rb') as f:
             data = f.read()
-    except IOError as e:
+    except OSError as e:
         raise PuzParseError(f"Cannot read file: {e}")
-    
-    if len(data) < 52:
-        raise PuzParseError("File too small to be a valid .puz file")
-    
+    return parse_puz_bytes(data, verify)
+
+
+def parse_puz_bytes(data: bytes, verify: bool = True) -> PuzPuzzle:
+    """
+    Parse the contents of a .puz file.
+
+    The header is read with one struct unpack and the string area with one bounded split, using
+    the clue count from the header to tell clues, notes and extension sections apart. With verify
+    set the CIB, global and masked checksums and every extension section checksum must match, so
+    corrupt files are rejected here rather than producing a broken puzzle later.
+
+    Raises:
+        PuzParseError: If the data is not a complete .puz file
+        PuzChecksumError: If verify is set and a checksum does not match
+    """
+    header = read_puz_header(data)
+    width = header.width
+    height = header.height
+    clue_count = header.clue_count
+
     puzzle = PuzPuzzle()
-    
-    # Parse header (first 52 bytes)
-    # Checksum values we'll skip for now
-    offset = 0x2C  # Skip to width/height
-    
-    puzzle.width = data[offset]
-    puzzle.height = data[offset + 1]
-    
-    if puzzle.width == 0 or puzzle.height == 0:
-        raise PuzParseError("Invalid grid dimensions")
-    
-    num_cells = puzzle.width * puzzle.height
-    
-    # Skip clue count and puzzle type for now
-    offset = 0x34  # Start of solution
-    
-    # Read solution (answer grid)
-    solution_end = offset + num_cells
-    if len(data) < solution_end:
+    puzzle.width = width
+    puzzle.height = height
+    puzzle.version = header.version
+    puzzle.puzzle_type = header.puzzle_type
+    puzzle.scrambled = header.scrambled
+    # Version 2 files store text as UTF-8, older ones as ISO-8859-1.
+    encoding = "utf-8" if puzzle.version.startswith("2.") else "iso-8859-1"
+
+    num_cells = width * height
+    offset = HEADER.size
+    grids_end = offset + 2 * num_cells
+    if len(data) < grids_end:
         raise PuzParseError("File too short for grid data")
-    
-    puzzle.solution = [chr(b) if b != 0x2E else '.' for b in data[offset:solution_end]]
-    offset = solution_end
-    
-    # Read fill (player state) - usually all dashes
-    fill_end = offset + num_cells
-    if len(data) < fill_end:
-        raise PuzParseError("File too short for fill data")
-    
-    puzzle.fill = [chr(b) if b != 0x2D else '-' for b in data[offset:fill_end]]
-    offset = fill_end
-    
-    # Read null-terminated strings: title, author, copyright, then clues
-    strings = []
-    current_string = bytearray()
-    
-    while offset < len(data):
-        byte = data[offset]
-        offset += 1
-        
-        if byte == 0:  # Null terminator
-            try:
-                strings.append(current_string.decode('iso-8859-1'))
-            except UnicodeDecodeError:
-                strings.append(current_string.decode('utf-8', errors='replace'))
-            current_string = bytearray()
-        else:
-            current_string.append(byte)
-    
-    # Assign strings to puzzle fields
-    if len(strings) < 3:
-        raise PuzParseError("Missing required string fields")
-    
-    puzzle.title = strings[0]
-    puzzle.author = strings[1]
-    puzzle.copyright = strings[2]
-    
-    # Remaining strings are clues (and possibly notes at the end)
-    puzzle.clues = strings[3:]
-    
-    # Notes might be in a special section (we'll skip advanced parsing for now)
-    # If last string looks like notes, separate it
-    if puzzle.clues and len(puzzle.clues[-1]) > 100:
-        puzzle.notes = puzzle.clues.pop()
-    
+    solution = data[offset:offset + num_cells]
+    fill = data[offset + num_cells:grids_end]
+    puzzle.solution = solution.decode("iso-8859-1")
+    puzzle.fill = fill.decode("iso-8859-1")
+
+    # Title, author, copyright, the clues and the notes are NUL terminated; whatever follows the
+    # notes is extension sections, which may contain NUL bytes themselves.
+    string_count = 3 + clue_count + 1
+    parts = data[grids_end:].split(b"\0", string_count)
+    if len(parts) <= string_count:
+        raise PuzParseError(f"Missing string fields: expected {string_count}, found {len(parts) - 1}")
+    strings = parts[:string_count]
+    title, author, copyright_, *clues, notes = strings
+    puzzle.title = title.decode(encoding, errors="replace")
+    puzzle.author = author.decode(encoding, errors="replace")
+    puzzle.copyright = copyright_.decode(encoding, errors="replace")
+    puzzle.clues = [clue.decode(encoding, errors="replace") for clue in clues]
+    puzzle.notes = notes.decode(encoding, errors="replace")
+
+    if verify:
+        cib = puz_checksum(data[CIB_OFFSET:CIB_OFFSET + CIB_LENGTH])
+        if cib != header.cib_checksum:
+            raise PuzChecksumError("Header (CIB) checksum mismatch")
+        text = _text_checksum(strings, puzzle.version)
+        overall = _text_checksum(strings, puzzle.version, puz_checksum(fill, puz_checksum(solution, cib)))
+        if overall != header.checksum:
+            raise PuzChecksumError("Global checksum mismatch")
+        masked = _masked_checksums(cib, puz_checksum(solution), puz_checksum(fill), text)
+        if (header.masked_low, header.masked_high) != masked:
+            raise PuzChecksumError("Masked checksum mismatch")
+
+    _parse_extensions(puzzle, parts[string_count], verify)
     return puzzle
 
 
+def read_puz_header(data, offset: int = 0) -> PuzHeader:
+    """
+    Decode the fixed header of the .puz file starting at offset in data (bytes, mmap or any buffer).
+
+    Only the header's 52 bytes are read.
+
+    Raises:
+        PuzParseError: If there is no valid header at offset
+    """
+    if len(data) - offset < HEADER.size:
+        raise PuzParseError("File too small to be a valid .puz file")
+    (
+        checksum,
+        magic,
+        cib_checksum,
+        masked_low,
+        masked_high,
+        version,
+        _,
+        _,
+        _,
+        width,
+        height,
+        clue_count,
+        puzzle_type,
+        scrambled_state,
+    ) = HEADER.unpack_from(data, offset)
+    if magic != MAGIC:
+        raise PuzParseError("Missing ACROSS&DOWN file magic")
+    if width == 0 or height == 0:
+        raise PuzParseError("Invalid grid dimensions")
+    return PuzHeader(
+        checksum,
+        cib_checksum,
+        masked_low,
+        masked_high,
+        version.rstrip(b"\0").decode("ascii", errors="replace"),
+        width,
+        height,
+        clue_count,
+        puzzle_type,
+        bool(scrambled_state & SCRAMBLED),
+    )
+
+
+def _text_checksum(strings: List[bytes], version: str, checksum: int = 0) -> int:
+    title, author, copyright_, *clues, notes = strings
+    # Title, author, copyright and notes count with their terminator, and only when present.
+    for field in (title, author, copyright_):
+        if field:
+            checksum = puz_checksum(field + b"\0", checksum)
+    for clue in clues:
+        checksum = puz_checksum(clue, checksum)
+    if notes and version >= "1.3":
+        checksum = puz_checksum(notes + b"\0", checksum)
+    return checksum
+
+
+def _masked_checksums(cib: int, solution: int, fill: int, text: int) -> Tuple[bytes, bytes]:
+    sums = (cib, solution, fill, text)
+    low = bytes(MASK[index] ^ (value & 0xFF) for index, value in enumerate(sums))
+    high = bytes(MASK[index + 4] ^ (value >> 8) for index, value in enumerate(sums))
+    return low, high
+
+
+def _parse_extensions(puzzle: PuzPuzzle, data: bytes, verify: bool) -> None:
+    offset = 0
+    while offset + SECTION.size <= len(data):
+        name, length, checksum = SECTION.unpack_from(data, offset)
+        start = offset + SECTION.size
+        end = start + length
+        if end > len(data):
+            raise PuzParseError(f"Extension section {name!r} is truncated")
+        body = data[start:end]
+        if verify and puz_checksum(body) != checksum:
+            raise PuzChecksumError(f"Extension section {name!r} checksum mismatch")
+        # Each section's data is followed by a NUL byte.
+        if verify and data[end:end + 1] != b"\0":
+            raise PuzParseError(f"Extension section {name!r} is not NUL terminated")
+        puzzle.extensions[name.decode("iso-8859-1")] = body
+        offset = end + 1
+    if verify and data[offset:].strip(b"\0"):
+        raise PuzParseError("Unexpected data after the extension sections")
+
+    num_cells = puzzle.width * puzzle.height
+    extensions = puzzle.extensions
+    if "GEXT" in extensions:
+        if len(extensions["GEXT"]) != num_cells:
+            raise PuzParseError("GEXT section does not cover the grid")
+        puzzle.markup = extensions["GEXT"]
+    if "GRBS" in extensions and "RTBL" in extensions:
+        cells = extensions["GRBS"]
+        if len(cells) != num_cells:
+            raise PuzParseError("GRBS section does not cover the grid")
+        table = _parse_rebus_table(extensions["RTBL"])
+        for cell, key in enumerate(cells):
+            # GRBS stores one more than the RTBL key; 0 means no rebus.
+            if key and key - 1 in table:
+                puzzle.rebus[cell] = table[key - 1]
+    if "LTIM" in extensions:
+        elapsed, _, stopped = extensions["LTIM"].decode("ascii", errors="replace").partition(",")
+        try:
+            puzzle.timer = (int(elapsed), stopped.strip() == "1")
+        except ValueError:
+            raise PuzParseError(f"Malformed LTIM section {extensions['LTIM']!r}") from None
+
+
+def _parse_rebus_table(data: bytes) -> Dict[int, str]:
+    # Entries look like " 1:ABC;" with the key padded to two characters.
+    table = {}
+    for item in data.decode("iso-8859-1").split(";"):
+        key, separator, answer = item.partition(":")
+        if not separator:
+            continue
+        try:
+            table[int(key)] = answer
+        except ValueError:
+            raise PuzParseError(f"Malformed RTBL entry {item!r}") from None
+    return table
+
+
+def serialize_puz(puzzle: PuzPuzzle) -> bytes:
+    """
+    Encode a PuzPuzzle as .puz bytes with correct checksums.
+
+    Extension sections are written from puzzle.extensions as they are; the decoded rebus, markup
+    and timer fields are not re-encoded.
+    """
+    encoding = "utf-8" if puzzle.version.startswith("2.") else "iso-8859-1"
+    num_cells = puzzle.width * puzzle.height
+    solution = puzzle.solution.encode("iso-8859-1")
+    fill = puzzle.fill.encode("iso-8859-1")
+    if len(solution) != num_cells or len(fill) != num_cells:
+        raise ValueError(f"Solution and fill must both have {num_cells} cells")
+    strings = [
+        puzzle.title.encode(encoding),
+        puzzle.author.encode(encoding),
+        puzzle.copyright.encode(encoding),
+        *(clue.encode(encoding) for clue in puzzle.clues),
+        puzzle.notes.encode(encoding),
+    ]
+    scrambled = SCRAMBLED if puzzle.scrambled else 0
+    cib_bytes = struct.pack(
+        "<BBHHH", puzzle.width, puzzle.height, len(puzzle.clues), puzzle.puzzle_type, scrambled
+    )
+    cib = puz_checksum(cib_bytes)
+    text = _text_checksum(strings, puzzle.version)
+    overall = _text_checksum(strings, puzzle.version, puz_checksum(fill, puz_checksum(solution, cib)))
+    low, high = _masked_checksums(cib, puz_checksum(solution), puz_checksum(fill), text)
+    version = puzzle.version.encode("ascii")[:3].ljust(3, b"\0") + b"\0"
+    header = HEADER.pack(
+        overall,
+        MAGIC,
+        cib,
+        low,
+        high,
+        version,
+        b"\0\0",
+        0,
+        b"\0" * 12,
+        puzzle.width,
+        puzzle.height,
+        len(puzzle.clues),
+        puzzle.puzzle_type,
+        scrambled,
+    )
+    parts = [header, solution, fill, b"".join(string + b"\0" for string in strings)]
+    for name, body in puzzle.extensions.items():
+        parts.append(SECTION.pack(name.encode("iso-8859-1"), len(body), puz_checksum(body)))
+        parts.append(body + b"\0")
+    return b"".join(parts)
+
+
+class LazyPuz:
+    """
+    A .puz file inside a larger buffer (usually a memory map), decoded only as far as it is used.
+
+    The header is read up front; the solution grid and the full puzzle are decoded on first access.
+    close() (or leaving a with block) releases the buffer if the LazyPuz owns it, as it does when it
+    comes from open_puz_file; one taken from a PuzArchive shares the archive's map instead.
+    """
+
+    def __init__(
+        self,
+        buffer,
+        offset: int = 0,
+        length: Optional[int] = None,
+        verify: bool = True,
+        owns_buffer: bool = False,
+    ):
+        self.header = read_puz_header(buffer, offset)
+        self._buffer = buffer
+        self._offset = offset
+        self._end = len(buffer) if length is None else offset + length
+        self._verify = verify
+        self._owns_buffer = owns_buffer
+        self._puzzle: Optional[PuzPuzzle] = None
+
+    def __enter__(self) -> "LazyPuz":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._owns_buffer:
+            self._buffer.close()
+
+    @property
+    def width(self) -> int:
+        return self.header.width
+
+    @property
+    def height(self) -> int:
+        return self.header.height
+
+    @property
+    def clue_count(self) -> int:
+        return self.header.clue_count
+
+    @property
+    def solution(self) -> str:
+        """The solution grid alone, without parsing strings or checking checksums"""
+        if self._puzzle is not None:
+            return self._puzzle.solution
+        start = self._offset + HEADER.size
+        end = start + self.header.width * self.header.height
+        if end > self._end:
+            raise PuzParseError("File too short for grid data")
+        return self._buffer[start:end].decode("iso-8859-1")
+
+    @property
+    def puzzle(self) -> PuzPuzzle:
+        """The fully parsed (and, unless disabled, checksum-verified) puzzle"""
+        if self._puzzle is None:
+            self._puzzle = parse_puz_bytes(self._buffer[self._offset:self._end], self._verify)
+        return self._puzzle
+
+
+def _map_file(file_path: str) -> mmap.mmap:
+    try:
+        with open(file_path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # mmap refuses empty files
+        raise PuzParseError("File too small to be a valid .puz file")
+    except OSError as e:
+        raise PuzParseError(f"Cannot read file: {e}")
+
+
+def open_puz_file(file_path: str, verify: bool = True) -> LazyPuz:
+    """
+    Memory-map a .puz file and read its header; the rest is read only if accessed. Close the
+    result (or use it in a with block) to release the map.
+
+    Raises:
+        PuzParseError: If the file cannot be read or has no valid header
+    """
+    mapped = _map_file(file_path)
+    try:
+        return LazyPuz(mapped, verify=verify, owns_buffer=True)
+    except PuzParseError:
+        mapped.close()
+        raise
+
+
+class PuzArchive:
+    """
+    Many .puz files concatenated into one memory-mapped archive (see write_puz_archive).
+
+    Opening an archive reads only its offset table. Indexing gives a LazyPuz, and headers() reads
+    just the header of each file, so filtering an archive by size or clue count touches 52 bytes
+    per puzzle.
+    """
+
+    def __init__(self, file_path: str, verify: bool = True):
+        self._map = _map_file(file_path)
+        self._verify = verify
+        if len(self._map) < ARCHIVE_HEADER.size:
+            self._map.close()
+            raise PuzParseError("File too small to be a .puz archive")
+        magic, count, table_offset = ARCHIVE_HEADER.unpack_from(self._map)
+        table_end = table_offset + count * ARCHIVE_ENTRY.size
+        if magic != ARCHIVE_MAGIC or table_end > len(self._map):
+            self._map.close()
+            raise PuzParseError("Not a .puz archive, or a truncated one")
+        self._entries: List[Tuple[int, int]] = list(
+            ARCHIVE_ENTRY.iter_unpack(self._map[table_offset:table_end])
+        )
+        for offset, length in self._entries:
+            if offset + length > table_offset:
+                self._map.close()
+                raise PuzParseError("Archive offset table points past the puzzle data")
+
+    def __enter__(self) -> "PuzArchive":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, index: int) -> LazyPuz:
+        offset, length = self._entries[index]
+        return LazyPuz(self._map, offset, length, self._verify)
+
+    def __iter__(self) -> Iterator[LazyPuz]:
+        return (self[index] for index in range(len(self)))
+
+    def headers(self) -> Iterator[PuzHeader]:
+        """Every file's header in archive order, reading nothing else"""
+        for offset, _ in self._entries:
+            yield read_puz_header(self._map, offset)
+
+
+def write_puz_archive(file_path: str, files: Iterable[bytes]) -> int:
+    """
+    Write .puz file contents into one archive for PuzArchive; returns how many were written.
+
+    Raises:
+        PuzParseError: If one of the files does not start with a valid .puz header
+    """
+    entries = []
+    with open(file_path, 'wb') as f:
+        f.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, 0, 0))
+        for data in files:
+            read_puz_header(data)
+            entries.append(ARCHIVE_ENTRY.pack(f.tell(), len(data)))
+            f.write(data)
+        table_offset = f.tell()
+        f.write(b"".join(entries))
+        f.seek(0)
+        f.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, len(entries), table_offset))
+    return len(entries)
+
+
 def validate_puzzle_for_apworld(puzzle: PuzPuzzle, max_words: int = 30) -> Tuple[bool, Optional[str]]:
     """
     Validate that a puzzle is suitable for CrosswordAP.
-    
+
     Returns:
         (is_valid, error_message)
     """
+    # A scrambled solution holds the scrambled letters, not the answers
+    if puzzle.scrambled:
+        return False, "Solution is scrambled"
+
+    # The client only has letter cells (no diagramless blocks, digits or symbols)
+    other = _NON_LETTER_CELL.search(puzzle.solution)
+    if other:
+        return False, f"Non-letter solution cell: {other.group()!r}"
+
     # Check grid size (reasonable limits for display)
     if puzzle.width > 21 or puzzle.height > 21:
         return False, f"Grid too large: {puzzle.width}x{puzzle.height} (max 21x21)"
-    
+
     if puzzle.width < 5 or puzzle.height < 5:
         return False, f"Grid too small: {puzzle.width}x{puzzle.height} (min 5x5)"
-    
+
     # Count words
-    clue_map = puzzle.get_clue_map()
-    total_words = len(clue_map["across"]) + len(clue_map["down"])
-    
+    total_words = puzzle.word_count
+
     if total_words > max_words:
         return False, f"Too many words: {total_words} (max {max_words})"
-    
+
     if total_words < 10:
         return False, f"Too few words: {total_words} (min 10)"
-    
+
     # Verify we have clues for all words
     if len(puzzle.clues) < total_words:
         return False, f"Missing clues: found {len(puzzle.clues)}, expected {total_words}"
-    
+
+    # The client drops shorter entries, which would leave their locations unreachable
+    short = sum(entry.length < MIN_ENTRY_LENGTH for entry in puzzle.entries)
+    if short:
+        return False, f"Entries too short: {short} under {MIN_ENTRY_LENGTH} letters"
+
     return True, None
 
 
@@ -228,17 +661,19 @@ if __name__ == "__main__":
             print(f"Author: {puzzle.author}")
             print(f"Grid: {puzzle.width}x{puzzle.height}")
             print(f"Clues: {len(puzzle.clues)}")
-            
+            if puzzle.extensions:
+                print(f"Extensions: {', '.join(puzzle.extensions)}")
+
             clue_map = puzzle.get_clue_map()
             print(f"Across: {len(clue_map['across'])}")
             print(f"Down: {len(clue_map['down'])}")
-            
+
             valid, error = validate_puzzle_for_apworld(puzzle)
             if valid:
                 print("✓ Valid for CrosswordAP")
             else:
                 print(f"✗ Invalid: {error}")
-                
+
         except PuzParseError as e:
             print(f"Error: {e}")
     else:
@@ -2,8 +2,36 @@ from __future__ import annotations
 
 import math
 import random
+import sys
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .board import CrosswordBoard
+from .placement_scorer import (
+    SCORER_NUMPY,
+    SCORER_PYTHON,
+    SCORERS,
+    NumpyPlacementScorer,
+    ScoredPlacement,
+    numpy_available,
+    rank_placements,
+)
+from .stats import (
+    PHASE_BACKTRACK,
+    PHASE_FILL,
+    PHASE_LAYOUT,
+    PHASE_PREPARE,
+    REJECT_ADJACENT,
+    REJECT_BLOCKED_END,
+    REJECT_BOUNDS,
+    REJECT_LETTER_MISMATCH,
+    REJECT_NO_CROSSING,
+    REJECT_NO_SHARED_LETTER,
+    REJECT_OVERLAP,
+    GenerationStats,
+)
+from .wordlist import WordIndex
 
 Direction = str
 EntryDict = Dict[str, Any]
@@ -12,6 +40,40 @@ Position = Tuple[int, int]
 DIR_ACROSS: Direction = "across"
 DIR_DOWN: Direction = "down"
 
+# Placement engines: "word" walks the shuffled word list and looks for a spot for each word,
+# "slot" walks the open crossings on the board and looks up a word that fits each one.
+ENGINE_WORD = "word"
+ENGINE_SLOT = "slot"
+
+# Placement policies for the word engine: "first" takes the first legal spot found for a word,
+# "best" scores every legal spot by crossings and bounding box growth and takes the best one.
+PLACEMENT_FIRST = "first"
+PLACEMENT_BEST = "best"
+# One crossing is worth this many cells of bounding box growth under the "best" policy.
+CROSSING_WEIGHT = 12.0
+
+# Bump whenever the same search request can produce a different layout, so cached layouts from
+# older generators are not reused, and re-record tools/golden_seeds.json. Slot data carries it so a
+# room's puzzle can be traced back to the generator that made it.
+GENERATOR_VERSION = 6
+
+# Version of the compact slot data layout written by PuzzleLayout.as_compact_dict.
+LAYOUT_FORMAT_VERSION = 1
+BLOCK = "#"
+# Key order of a placed entry, as the generator builds it. Slot data is pickled, so a rebuilt layout
+# must keep this order to give the same bytes as a freshly generated one.
+ENTRY_FIELDS = ("word", "clue", "category", "direction", "start", "location_index")
+
+CHECK_OUTCOMES = (
+    None,
+    REJECT_BOUNDS,
+    REJECT_BLOCKED_END,
+    REJECT_LETTER_MISMATCH,
+    REJECT_OVERLAP,
+    REJECT_ADJACENT,
+    REJECT_NO_CROSSING,
+)
+
 
 @dataclass
 class PuzzleLayout:
@@ -26,12 +88,308 @@ class PuzzleLayout:
             "entries": self.entries,
         }
 
+    def as_compact_dict(self) -> Dict[str, Any]:
+        """
+        Smaller slot data form: the board as one row-major string, no mask (it follows from the
+        board), and entries as parallel columns with categories stored once in a string table.
+        """
+        categories: List[str] = []
+        category_ids: Dict[str, int] = {}
+        columns: Dict[str, Any] = {
+            "word": [],
+            "clue": [],
+            "category": [],
+            "row": [],
+            "col": [],
+            "location_index": [],
+        }
+        directions: List[str] = []
+        for entry in self.entries:
+            category = str(entry.get("category", ""))
+            if category not in category_ids:
+                category_ids[category] = len(categories)
+                categories.append(category)
+            row, col = entry.get("start", (0, 0))
+            columns["word"].append(entry["word"])
+            columns["clue"].append(entry.get("clue", ""))
+            columns["category"].append(category_ids[category])
+            columns["row"].append(row)
+            columns["col"].append(col)
+            columns["location_index"].append(entry.get("location_index", len(directions) + 1))
+            directions.append("A" if entry.get("direction") == DIR_ACROSS else "D")
+        columns["direction"] = "".join(directions)
+        return {
+            "version": LAYOUT_FORMAT_VERSION,
+            "rows": len(self.board),
+            "cols": len(self.board[0]) if self.board else 0,
+            "board": "".join("".join(row) for row in self.board),
+            "categories": categories,
+            "entries": columns,
+        }
+
+    def interned(self) -> PuzzleLayout:
+        """
+        This layout with every string interned. Pickle writes a shared object once and refers back
+        to it, so equal strings must be one object however the layout was made (in this process,
+        in a worker, or read back from a cache or pool) for slot data to pickle to the same bytes.
+        """
+        entries: List[EntryDict] = [
+            {
+                sys.intern(name): sys.intern(value) if isinstance(value, str) else value
+                for name, value in entry.items()
+            }
+            for entry in self.entries
+        ]
+        board = [[sys.intern(cell) for cell in row] for row in self.board]
+        return PuzzleLayout(board, [sys.intern(row) for row in self.mask], entries)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> PuzzleLayout:
+        """Rebuild a layout from either as_dict or as_compact_dict output, entries in ENTRY_FIELDS order."""
+        if "version" not in data:
+            entries = []
+            for entry in data["entries"]:
+                ordered = {name: entry[name] for name in ENTRY_FIELDS if name in entry}
+                ordered.update(entry)
+                ordered["start"] = list(entry["start"])
+                entries.append(ordered)
+            return cls([list(row) for row in data["board"]], list(data["mask"]), entries)
+        version = data["version"]
+        if version != LAYOUT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact layout version {version!r}")
+        rows = int(data["rows"])
+        cols = int(data["cols"])
+        cells = data["board"]
+        if len(cells) != rows * cols:
+            raise ValueError(f"Compact layout board has {len(cells)} cells, expected {rows}x{cols}")
+        board = [list(cells[start : start + cols]) for start in range(0, rows * cols, cols)]
+        mask = ["".join(BLOCK if cell == BLOCK else "." for cell in row) for row in board]
+        columns = data["entries"]
+        categories = data["categories"]
+        entries: List[EntryDict] = []
+        for index, word in enumerate(columns["word"]):
+            entries.append(
+                {
+                    "word": word,
+                    "clue": columns["clue"][index],
+                    "category": categories[columns["category"][index]],
+                    "direction": DIR_ACROSS if columns["direction"][index] == "A" else DIR_DOWN,
+                    "start": [columns["row"][index], columns["col"][index]],
+                    "location_index": columns["location_index"][index],
+                }
+            )
+        return cls(board, mask, entries)
+
+
+@dataclass(frozen=True)
+class CrossingSlot:
+    """
+    An open line on the board that a new word could occupy by crossing existing letters.
+
+    Offsets are measured along the line: columns for across slots, rows for down slots.
+    `line` is the fixed row (across) or column (down), and every cell between `lo` and `hi`
+    may hold a letter of the new word. `fixed` lists the letters already on the line.
+    """
+
+    line: int
+    direction: Direction
+    lo: int
+    hi: int
+    fixed: Tuple[Tuple[int, str], ...]
+
+    @property
+    def max_length(self) -> int:
+        return self.hi - self.lo + 1
+
+
+@dataclass(frozen=True)
+class BacktrackBudget:
+    """
+    Limits for the backtracking pass that runs when an attempt stalls short of max_words.
+
+    max_nodes caps the number of search steps, max_seconds the wall time (None for no limit),
+    max_undo how many of the stalled attempt's last placements may be taken back, and branching
+    how many alternative placements are tried at each step. Attempts that stalled more than
+    max_shortfall words short are left alone, since a few undos rarely rescue them.
+    """
+
+    max_nodes: int = 400
+    max_seconds: Optional[float] = None
+    max_undo: int = 4
+    branching: int = 4
+    max_shortfall: int = 4
+
+
+class CandidateTable:
+    """
+    Word list entries prepared once for every generate() call over the same words and weights.
+
+    Entries are converted to dicts once, in word list order (so ids match the word list's
+    WordIndex), with each word's category weight. An attempt then draws the word ids that fit its
+    grid lazily, in weighted order, instead of copying, filtering and re-weighting the whole list.
+    """
+
+    def __init__(
+        self,
+        word_entries: Sequence[Any],
+        min_length: int,
+        category_weights: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.source = word_entries
+        self.min_length = min_length
+        self.weights = _sanitize_category_weights(category_weights or {})
+        default_weight = self.weights["_default"]
+        self.entries: List[EntryDict] = [_as_entry_dict(entry) for entry in word_entries]
+        self.words: List[str] = [entry.get("word", "") for entry in self.entries]
+        self.word_weights: List[float] = [
+            max(float(self.weights.get(str(entry.get("category", "")), default_weight)), 0.0)
+            for entry in self.entries
+        ]
+        self._index: Optional[WordIndex] = None
+        # Per longest fitting word: the ids that can be drawn, and the same ids grouped by weight.
+        self._eligible: Dict[int, List[int]] = {}
+        self._groups: Dict[int, List[Tuple[float, List[int]]]] = {}
+        self._starters: Dict[Tuple[int, int], List[int]] = {}
+
+    @property
+    def index(self) -> WordIndex:
+        """The word list's own index if it has one, otherwise one built over the table's words."""
+        if self._index is None:
+            index = getattr(self.source, "index", None)
+            self._index = index if isinstance(index, WordIndex) else WordIndex(self.words)
+        return self._index
+
+    def eligible(self, max_length: int) -> List[int]:
+        """Ids of the words an attempt may draw: long enough, at most max_length and weighted above 0."""
+        cached = self._eligible.get(max_length)
+        if cached is None:
+            cached = self._eligible[max_length] = [
+                word_id
+                for word_id, word in enumerate(self.words)
+                if word and self.min_length <= len(word) <= max_length and self.word_weights[word_id] > 0.0
+            ]
+        return cached
+
+    def sample(self, max_length: int, rng: random.Random) -> Iterator[EntryDict]:
+        """
+        Yield the eligible entries lazily in weighted random order, without replacement.
+
+        Each step picks a weight group with probability (weight x words left in it) / (total weight
+        left), then a uniform word from that group, which is the same order distribution as giving
+        every word the key u ** (1 / weight) and sorting. Weights come from categories, so there are
+        only a few groups and each entry costs a couple of random draws; an attempt that stops early
+        never pays for the rest of the word list.
+        """
+        groups = [(weight, list(ids)) for weight, ids in self._weight_groups(max_length)]
+        entries = self.entries
+        draw = rng.random
+        below = rng.randrange
+        total = sum(weight * len(ids) for weight, ids in groups)
+        while groups:
+            chosen = len(groups) - 1
+            if chosen:
+                point = draw() * total
+                for position, (weight, ids) in enumerate(groups):
+                    point -= weight * len(ids)
+                    if point < 0.0:
+                        chosen = position
+                        break
+            weight, ids = groups[chosen]
+            # Swap-remove a random id: a Fisher-Yates shuffle run one step at a time.
+            position = below(len(ids))
+            word_id = ids[position]
+            ids[position] = ids[-1]
+            ids.pop()
+            if ids:
+                total -= weight
+            else:
+                del groups[chosen]
+                # Recount rather than subtract, so rounding never drifts across many removals.
+                total = sum(group_weight * len(group_ids) for group_weight, group_ids in groups)
+            yield entries[word_id]
+
+    def _weight_groups(self, max_length: int) -> List[Tuple[float, List[int]]]:
+        cached = self._groups.get(max_length)
+        if cached is None:
+            grouped: Dict[float, List[int]] = {}
+            for word_id in self.eligible(max_length):
+                grouped.setdefault(self.word_weights[word_id], []).append(word_id)
+            cached = self._groups[max_length] = sorted(grouped.items())
+        return cached
+
+    def starters(self, max_length: int, cols: int, denylist: Iterable[str]) -> List[int]:
+        """Eligible ids that fit across `cols`, without denylisted words unless nothing else fits."""
+        cached = self._starters.get((max_length, cols))
+        if cached is None:
+            fitting = [word_id for word_id in self.eligible(max_length) if len(self.words[word_id]) <= cols]
+            denied = set(denylist)
+            cached = [word_id for word_id in fitting if self.words[word_id] not in denied] or fitting
+            self._starters[(max_length, cols)] = cached
+        return cached
+
+
+def _as_entry_dict(entry: Any) -> EntryDict:
+    # Accept both plain dictionaries and the immutable WordEntry records from the shared corpus.
+    if isinstance(entry, Mapping):
+        return dict(entry)
+    return {"word": entry.word, "clue": entry.clue, "category": entry.category}
+
+
+def _sanitize_category_weights(category_weights: Dict[str, float]) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for key, value in category_weights.items():
+        safe_value = max(float(value), 0.0)
+        weights[str(key)] = safe_value
+    if "_default" not in weights:
+        weights["_default"] = 1.0
+    elif weights["_default"] <= 0.0:
+        weights["_default"] = 0.0
+    return weights
+
 
 class CrosswordPuzzleGenerator:
     STARTER_DENYLIST = {"ACOUSTICS"}
+    ENGINES = (ENGINE_WORD, ENGINE_SLOT)
+    PLACEMENTS = (PLACEMENT_FIRST, PLACEMENT_BEST)
 
-    def __init__(self, rng: random.Random) -> None:
+    def __init__(
+        self,
+        rng: random.Random,
+        engine: str = ENGINE_WORD,
+        backtrack: Optional[BacktrackBudget] = None,
+        scorer: str = SCORER_PYTHON,
+        placement: str = PLACEMENT_FIRST,
+    ) -> None:
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown placement engine {engine!r}; expected one of {self.ENGINES}")
+        if placement not in self.PLACEMENTS:
+            raise ValueError(f"Unknown placement policy {placement!r}; expected one of {self.PLACEMENTS}")
+        if scorer not in SCORERS:
+            raise ValueError(f"Unknown placement scorer {scorer!r}; expected one of {SCORERS}")
+        if scorer == SCORER_NUMPY and not numpy_available():
+            raise ValueError("The numpy placement scorer needs NumPy installed")
         self._rng = rng
+        self._engine = engine
+        self._backtrack_budget = backtrack
+        self._placement = placement
+        self._numpy_scorer = NumpyPlacementScorer() if scorer == SCORER_NUMPY else None
+        self._stats = GenerationStats()
+        # Placement check outcomes (None for accepted), tallied here on the hot path and folded
+        # into the stats when they are read.
+        self._checks: Dict[Optional[str], int] = dict.fromkeys(CHECK_OUTCOMES, 0)
+
+    @property
+    def stats(self) -> GenerationStats:
+        """Counters accumulated over every generate() call on this generator."""
+        stats = self._stats
+        checks = self._checks
+        for reason, count in checks.items():
+            if count:
+                stats.can_place_calls += count
+                if reason is not None:
+                    stats.reject(reason, count)
+                checks[reason] = 0
+        return stats
 
     def generate(
         self,
@@ -42,30 +400,35 @@ class CrosswordPuzzleGenerator:
         max_words: int,
         seed: Optional[int],
         category_weights: Optional[Dict[str, float]] = None,
+        table: Optional[CandidateTable] = None,
     ) -> Optional[PuzzleLayout]:
+        """
+        Lay out up to max_words entries on a rows x cols board, or None if fewer than two fit.
+
+        Callers making many attempts over the same words should build one CandidateTable (from the
+        same word_entries, min_length and category_weights) and pass it in, so the entries are not
+        prepared again on every call.
+        """
         if rows <= 0 or cols <= 0:
             return None
         if not word_entries:
             return None
 
+        stats = self._stats
+        started = time.perf_counter()
         rng = random.Random(seed)
-        weights = self._sanitize_category_weights(category_weights or {})
+        if table is None:
+            table = CandidateTable(word_entries, min_length, category_weights)
+        max_dimension = max(rows, cols)
 
-        candidates = self._filtered_entries(word_entries, min_length, rows, cols)
-        if not candidates:
-            return None
-        candidates = self._weighted_shuffle(candidates, weights, rng)
-        if not candidates:
+        if not table.eligible(max_dimension):
             return None
 
-        board = self._create_matrix(rows, cols, "")
-        horizontal_mask = self._create_matrix(rows, cols, False)
-        vertical_mask = self._create_matrix(rows, cols, False)
-        letter_positions: Dict[str, List[Position]] = {}
+        board = CrosswordBoard(rows, cols)
         placed_entries: List[EntryDict] = []
         used_words: Dict[str, bool] = {}
 
-        first_entry = self._select_start_entry(candidates, min_length, cols, rng, weights)
+        first_entry = self._select_start_entry(table, max_dimension, cols, rng)
         if not first_entry:
             return None
 
@@ -75,14 +438,7 @@ class CrosswordPuzzleGenerator:
             # Horizontal start
             first_row = rng.randrange(rows)
             first_col = rng.randrange(max(1, cols - len(first_word) + 1))
-            self._place_horizontal(
-                first_word,
-                first_row,
-                first_col,
-                board,
-                horizontal_mask,
-                letter_positions,
-            )
+            self._place_horizontal(first_word, first_row, first_col, board)
             first_dir = DIR_ACROSS
             first_start = (first_row, first_col)
         else:
@@ -90,27 +446,13 @@ class CrosswordPuzzleGenerator:
             if len(first_word) > rows:
                 first_row = rng.randrange(rows)
                 first_col = rng.randrange(max(1, cols - len(first_word) + 1))
-                self._place_horizontal(
-                    first_word,
-                    first_row,
-                    first_col,
-                    board,
-                    horizontal_mask,
-                    letter_positions,
-                )
+                self._place_horizontal(first_word, first_row, first_col, board)
                 first_dir = DIR_ACROSS
                 first_start = (first_row, first_col)
             else:
                 first_row = rng.randrange(max(1, rows - len(first_word) + 1))
                 first_col = rng.randrange(cols)
-                self._place_vertical(
-                    first_word,
-                    first_row,
-                    first_col,
-                    board,
-                    vertical_mask,
-                    letter_positions,
-                )
+                self._place_vertical(first_word, first_row, first_col, board)
                 first_dir = DIR_DOWN
                 first_start = (first_row, first_col)
 
@@ -126,25 +468,59 @@ class CrosswordPuzzleGenerator:
         placed_entries[-1]["location_index"] = len(placed_entries)
         used_words[first_word] = True
 
+        mark = time.perf_counter()
+        stats.add_time(PHASE_PREPARE, mark - started)
+        if self._engine == ENGINE_SLOT:
+            self._fill_slots(table, board, placed_entries, used_words, min_length, max_words, rng)
+        else:
+            self._fill_words(
+                table.sample(max_dimension, rng), board, placed_entries, used_words, min_length, max_words, rng
+            )
+        started, mark = mark, time.perf_counter()
+        stats.add_time(PHASE_FILL, mark - started)
+
+        budget = self._backtrack_budget
+        if budget is not None and 0 < max_words - len(placed_entries) <= budget.max_shortfall:
+            self._backtrack(table, board, placed_entries, used_words, min_length, max_words, rng, budget)
+            started, mark = mark, time.perf_counter()
+            stats.add_time(PHASE_BACKTRACK, mark - started)
+
+        if len(placed_entries) < 2:
+            return None
+
+        layout = self._build_layout_result(board, placed_entries)
+        stats.add_time(PHASE_LAYOUT, time.perf_counter() - mark)
+        return layout
+
+    def _fill_words(
+        self,
+        candidates: Iterable[EntryDict],
+        board: CrosswordBoard,
+        placed_entries: List[EntryDict],
+        used_words: Dict[str, bool],
+        min_length: int,
+        max_words: int,
+        rng: random.Random,
+    ) -> None:
+        max_dimension = max(board.rows, board.cols)
+
         failures = 0
         max_failures = max(200, max_words * 10)
+        best = self._placement == PLACEMENT_BEST
+        bounds = self._entry_bounds(placed_entries)
 
         for entry in candidates:
             word = entry["word"]
             if word in used_words:
                 continue
             length = len(word)
-            if length < min_length or length > max(rows, cols):
+            if length < min_length or length > max_dimension:
                 continue
 
-            placement = self._try_place_entry(
-                entry,
-                board,
-                horizontal_mask,
-                vertical_mask,
-                letter_positions,
-                rng,
-            )
+            if best:
+                placement = self._place_best_entry(entry, board, bounds, rng)
+            else:
+                placement = self._try_place_entry(entry, board, rng)
             if placement:
                 placement["location_index"] = len(placed_entries) + 1
                 placed_entries.append(placement)
@@ -157,92 +533,226 @@ class CrosswordPuzzleGenerator:
                 if failures >= max_failures:
                     break
 
-        if len(placed_entries) < 2:
-            return None
+    def _place_best_entry(
+        self,
+        entry: EntryDict,
+        board: CrosswordBoard,
+        bounds: List[int],
+        rng: random.Random,
+    ) -> Optional[EntryDict]:
+        """
+        Place the entry at its highest scoring legal spot and widen bounds to cover it.
 
-        return self._build_layout_result(board, placed_entries)
+        A spot scores CROSSING_WEIGHT per crossing minus the cells it adds to the bounding box of
+        the placed words (bounds is [min row, max row, min col, max col]); ties are broken with rng.
+        """
+        self._stats.probes += 1
+        word = entry["word"]
+        length = len(word)
+        placements = self._legal_placements(word, board)
+        if not placements:
+            return None
+        min_row, max_row, min_col, max_col = bounds
+        area = (max_row - min_row + 1) * (max_col - min_col + 1)
+        best_score = -math.inf
+        best: List[ScoredPlacement] = []
+        for placement in placements:
+            end_row = placement.row if placement.across else placement.row + length - 1
+            end_col = placement.col + length - 1 if placement.across else placement.col
+            grown = (max(max_row, end_row) - min(min_row, placement.row) + 1) * (
+                max(max_col, end_col) - min(min_col, placement.col) + 1
+            )
+            score = placement.crossings * CROSSING_WEIGHT - (grown - area)
+            if score > best_score:
+                best_score = score
+                best = [placement]
+            elif score == best_score:
+                best.append(placement)
+        choice = best[rng.randrange(len(best))] if len(best) > 1 else best[0]
+        board.place(word, choice.row, choice.col, across=choice.across)
+        end_row = choice.row if choice.across else choice.row + length - 1
+        end_col = choice.col + length - 1 if choice.across else choice.col
+        bounds[:] = (
+            min(min_row, choice.row),
+            max(max_row, end_row),
+            min(min_col, choice.col),
+            max(max_col, end_col),
+        )
+        return {
+            "word": word,
+            "clue": entry.get("clue", ""),
+            "category": entry.get("category", ""),
+            "direction": DIR_ACROSS if choice.across else DIR_DOWN,
+            "start": (choice.row, choice.col),
+        }
 
-    def _filtered_entries(
-        self, entries: Sequence[EntryDict], min_length: int, rows: int, cols: int
-    ) -> List[EntryDict]:
-        filtered: List[EntryDict] = []
-        max_dimension = max(rows, cols)
-        for entry in entries:
-            word = entry.get("word", "")
-            if not word:
-                continue
-            length = len(word)
-            if length < min_length or length > max_dimension:
-                continue
-            filtered.append(dict(entry))
-        return filtered
-
-    def _sanitize_category_weights(self, category_weights: Dict[str, float]) -> Dict[str, float]:
-        weights: Dict[str, float] = {}
-        for key, value in category_weights.items():
-            safe_value = max(float(value), 0.0)
-            weights[str(key)] = safe_value
-        if "_default" not in weights:
-            weights["_default"] = 1.0
-        elif weights["_default"] <= 0.0:
-            weights["_default"] = 0.0
-        return weights
-
-    def _weighted_shuffle(
-        self, entries: Sequence[EntryDict], weights: Dict[str, float], rng: random.Random
-    ) -> List[EntryDict]:
-        keyed: List[Tuple[float, EntryDict]] = []
-        default_weight = max(float(weights.get("_default", 1.0)), 0.0)
+    @staticmethod
+    def _entry_bounds(entries: Sequence[EntryDict]) -> List[int]:
+        """[min row, max row, min col, max col] covering every placed entry (there is at least one)."""
+        spans = []
         for entry in entries:
-            category = str(entry.get("category", ""))
-            weight = max(float(weights.get(category, default_weight)), 0.0)
-            if weight <= 0.0:
-                continue
-            random_value = rng.random()
-            if random_value <= 0.0:
-                random_value = 1e-6
-            key = math.pow(random_value, 1.0 / weight)
-            keyed.append((key, entry))
-        keyed.sort(key=lambda pair: pair[0], reverse=True)
-        return [entry for _, entry in keyed]
+            row, col = entry["start"]
+            last = len(entry["word"]) - 1
+            if entry["direction"] == DIR_ACROSS:
+                spans.append((row, row, col, col + last))
+            else:
+                spans.append((row, row + last, col, col))
+        return [
+            min(span[0] for span in spans),
+            max(span[1] for span in spans),
+            min(span[2] for span in spans),
+            max(span[3] for span in spans),
+        ]
 
-    def _select_start_entry(
+    def _backtrack(
         self,
-        entries: Sequence[EntryDict],
+        table: CandidateTable,
+        board: CrosswordBoard,
+        placed_entries: List[EntryDict],
+        used_words: Dict[str, bool],
         min_length: int,
-        cols: int,
+        max_words: int,
         rng: random.Random,
-        weights: Dict[str, float],
+        budget: BacktrackBudget,
+    ) -> None:
+        """
+        Try to grow a stalled attempt to max_words by taking back its last few placements.
+
+        For undo depths 0..max_undo the most recent placements are removed and a depth-first search
+        tries alternative placements from there, using the open crossing slots to find them. The first
+        layout reaching max_words is kept; if the budget runs out, the largest layout seen (at least
+        the stalled one) is left on the board.
+        """
+        deadline = None if budget.max_seconds is None else time.perf_counter() + budget.max_seconds
+        nodes_left = budget.max_nodes
+        best = list(placed_entries)
+
+        entries = table.entries
+        words = table.words
+        word_weights = table.word_weights
+        index = table.index
+        # Bits of every candidate id spelling a word, so a placement can retire duplicates too.
+        word_bits: Dict[str, int] = {}
+        for word_id in table.eligible(max(board.rows, board.cols)):
+            word = words[word_id]
+            word_bits[word] = word_bits.get(word, 0) | (1 << word_id)
+        allowed = 0
+        for word, bits in word_bits.items():
+            if word not in used_words:
+                allowed |= bits
+
+        def exhausted() -> bool:
+            return nodes_left <= 0 or (deadline is not None and time.perf_counter() >= deadline)
+
+        def extend() -> bool:
+            nonlocal nodes_left, best, allowed
+            if len(placed_entries) >= max_words:
+                return True
+            if len(placed_entries) > len(best):
+                best = list(placed_entries)
+            if exhausted():
+                return False
+            nodes_left -= 1
+            options: List[Tuple[int, Direction, int, int]] = []
+            slots = self._open_slots(board, min_length)
+            rng.shuffle(slots)
+            for slot in slots:
+                self._stats.probes += 1
+                for word_id, row, col in self._slot_candidates(
+                    slot, index, allowed, words, word_weights, board, min_length, rng
+                ):
+                    if all(word_id != option[0] for option in options):
+                        options.append((word_id, slot.direction, row, col))
+                    break
+                if len(options) >= budget.branching:
+                    break
+
+            for word_id, direction, row, col in options:
+                if exhausted():
+                    return False
+                entry = entries[word_id]
+                word = entry["word"]
+                board.place(word, row, col, across=direction == DIR_ACROSS)
+                placed_entries.append(
+                    {
+                        "word": word,
+                        "clue": entry.get("clue", ""),
+                        "category": entry.get("category", ""),
+                        "direction": direction,
+                        "start": (row, col),
+                        "location_index": len(placed_entries) + 1,
+                    }
+                )
+                used_words[word] = True
+                allowed &= ~word_bits[word]
+                if extend():
+                    return True
+                board.undo()
+                placed_entries.pop()
+                del used_words[word]
+                allowed |= word_bits[word]
+            return False
+
+        # Never take back the starter word; the board has nothing to cross without it.
+        max_undo = min(budget.max_undo, len(placed_entries) - 1)
+        for undo in range(max_undo + 1):
+            if exhausted():
+                break
+            keep = len(placed_entries) - undo
+            removed = placed_entries[keep:]
+            board.rollback(keep)
+            del placed_entries[keep:]
+            for entry in removed:
+                del used_words[entry["word"]]
+                allowed |= word_bits.get(entry["word"], 0)
+            if extend():
+                return
+            # Put the stalled layout back before trying a deeper undo.
+            for entry in removed:
+                self._replay_entry(entry, board, placed_entries, used_words)
+                allowed &= ~word_bits.get(entry["word"], 0)
+
+        if len(best) > len(placed_entries):
+            board.rollback(0)
+            placed_entries.clear()
+            used_words.clear()
+            for entry in best:
+                self._replay_entry(entry, board, placed_entries, used_words)
+
+    def _replay_entry(
+        self,
+        entry: EntryDict,
+        board: CrosswordBoard,
+        placed_entries: List[EntryDict],
+        used_words: Dict[str, bool],
+    ) -> None:
+        row, col = entry["start"]
+        board.place(entry["word"], row, col, across=entry["direction"] == DIR_ACROSS)
+        placed_entries.append(entry)
+        used_words[entry["word"]] = True
+
+    def _select_start_entry(
+        self, table: CandidateTable, max_length: int, cols: int, rng: random.Random
     ) -> Optional[EntryDict]:
-        # Collect candidates that fit on the first row as the seed entry.
-        options: List[EntryDict] = []
-        for entry in entries:
-            word = entry["word"]
-            if min_length <= len(word) <= cols:
-                options.append(entry)
-        if not options:
+        # Any candidate that fits on the first row, avoiding repetitive openers where possible.
+        starters = table.starters(max_length, cols, self.STARTER_DENYLIST)
+        if not starters:
             return None
-        # Shuffle and try to pick a starter not in the denylist to avoid repetitive openers.
-        rng.shuffle(options)
-        for entry in options:
-            if entry.get("word", "") not in self.STARTER_DENYLIST:
-                return entry
-        # Fallback: return any (still shuffled) entry if all are denied.
-        return options[0] if options else None
+        return table.entries[starters[rng.randrange(len(starters))]]
 
     def _try_place_entry(
         self,
         entry: EntryDict,
-        board: List[List[str]],
-        horizontal_mask: List[List[bool]],
-        vertical_mask: List[List[bool]],
-        letter_positions: Dict[str, List[Position]],
+        board: CrosswordBoard,
         rng: random.Random,
     ) -> Optional[EntryDict]:
+        self._stats.probes += 1
         word = entry["word"]
+        letter_positions = board.letter_positions
         length = len(word)
         indices = [i for i in range(length) if letter_positions.get(word[i])]
         if not indices:
+            self._stats.reject(REJECT_NO_SHARED_LETTER)
             return None
         rng.shuffle(indices)
 
@@ -254,10 +764,11 @@ class CrosswordPuzzleGenerator:
             rng.shuffle(positions)
 
             for row, col in positions:
+                cell = row * board.cols + col
                 directions: List[Direction] = []
-                if horizontal_mask[row][col]:
+                if board.across[cell]:
                     directions.append(DIR_DOWN)
-                if vertical_mask[row][col]:
+                if board.down[cell]:
                     directions.append(DIR_ACROSS)
                 if not directions:
                     continue
@@ -265,22 +776,8 @@ class CrosswordPuzzleGenerator:
                 for direction in directions:
                     if direction == DIR_ACROSS:
                         start_col = col - index
-                        if self._can_place_horizontal(
-                            word,
-                            row,
-                            start_col,
-                            board,
-                            horizontal_mask,
-                            vertical_mask,
-                        ):
-                            self._place_horizontal(
-                                word,
-                                row,
-                                start_col,
-                                board,
-                                horizontal_mask,
-                                letter_positions,
-                            )
+                        if self._can_place_horizontal(word, row, start_col, board):
+                            self._place_horizontal(word, row, start_col, board)
                             return {
                                 "word": word,
                                 "clue": entry.get("clue", ""),
@@ -290,22 +787,8 @@ class CrosswordPuzzleGenerator:
                             }
                     else:
                         start_row = row - index
-                        if self._can_place_vertical(
-                            word,
-                            start_row,
-                            col,
-                            board,
-                            horizontal_mask,
-                            vertical_mask,
-                        ):
-                            self._place_vertical(
-                                word,
-                                start_row,
-                                col,
-                                board,
-                                vertical_mask,
-                                letter_positions,
-                            )
+                        if self._can_place_vertical(word, start_row, col, board):
+                            self._place_vertical(word, start_row, col, board)
                             return {
                                 "word": word,
                                 "clue": entry.get("clue", ""),
@@ -315,140 +798,333 @@ class CrosswordPuzzleGenerator:
                             }
         return None
 
-    def _can_place_horizontal(
+    def _legal_placements(self, word: str, board: CrosswordBoard) -> List[ScoredPlacement]:
+        """Every legal placement of word, ranked by crossings (see placement_scorer.rank_placements)."""
+        if self._numpy_scorer is not None:
+            return self._numpy_scorer.placements(word, board)
+        return rank_placements(self._python_placements(word, board))
+
+    def _python_placements(self, word: str, board: CrosswordBoard) -> List[ScoredPlacement]:
+        """
+        Reference scorer: try each start implied by a letter the word shares with the board.
+
+        A legal placement crosses at least one existing letter, so these starts cover all of them.
+        """
+        cols = board.cols
+        cells = board.cells
+        starts = set()
+        placements: List[ScoredPlacement] = []
+        for offset, letter in enumerate(word):
+            for row, col in board.letter_positions.get(letter, ()):
+                cell = row * cols + col
+                if board.down[cell]:
+                    starts.add((row, col - offset, True))
+                if board.across[cell]:
+                    starts.add((row - offset, col, False))
+        for row, col, across in starts:
+            if across:
+                if not self._can_place_horizontal(word, row, col, board):
+                    continue
+                base = row * cols + col
+                crossings = sum(1 for i in range(len(word)) if cells[base + i])
+            else:
+                if not self._can_place_vertical(word, row, col, board):
+                    continue
+                base = row * cols + col
+                crossings = sum(1 for i in range(len(word)) if cells[base + i * cols])
+            placements.append(ScoredPlacement(crossings, row, col, across))
+        return placements
+
+    def _fill_slots(
         self,
-        word: str,
-        row: int,
-        col: int,
-        board: List[List[str]],
-        horizontal_mask: List[List[bool]],
-        vertical_mask: List[List[bool]],
-    ) -> bool:
-        rows = len(board)
+        table: CandidateTable,
+        board: CrosswordBoard,
+        placed_entries: List[EntryDict],
+        used_words: Dict[str, bool],
+        min_length: int,
+        max_words: int,
+        rng: random.Random,
+    ) -> None:
+        entries = table.entries
+        words = table.words
+        word_weights = table.word_weights
+        index = table.index
+
+        # Words that are filtered out (or weighted to zero) never enter the allowed bitset.
+        allowed = 0
+        for word_id in table.eligible(max(board.rows, board.cols)):
+            if words[word_id] not in used_words:
+                allowed |= 1 << word_id
+
+        while len(placed_entries) < max_words and allowed:
+            slots = self._open_slots(board, min_length)
+            rng.shuffle(slots)
+            placed_id: Optional[int] = None
+            for slot in slots:
+                placed_id = self._fill_slot(
+                    slot,
+                    index,
+                    allowed,
+                    entries,
+                    words,
+                    word_weights,
+                    board,
+                    placed_entries,
+                    min_length,
+                    rng,
+                )
+                if placed_id is not None:
+                    break
+            if placed_id is None:
+                break
+            placed_word = words[placed_id]
+            used_words[placed_word] = True
+            # Drop every id spelling the placed word so duplicates across categories are not reused.
+            for word_id in index.iter_ids(allowed & index.length_mask(len(placed_word))):
+                if words[word_id] == placed_word:
+                    allowed &= ~(1 << word_id)
+
+    def _fill_slot(
+        self,
+        slot: CrossingSlot,
+        index: WordIndex,
+        allowed: int,
+        entries: List[EntryDict],
+        words: List[str],
+        word_weights: List[float],
+        board: CrosswordBoard,
+        placed_entries: List[EntryDict],
+        min_length: int,
+        rng: random.Random,
+    ) -> Optional[int]:
+        self._stats.probes += 1
+        for word_id, row, col in self._slot_candidates(
+            slot, index, allowed, words, word_weights, board, min_length, rng
+        ):
+            entry = entries[word_id]
+            board.place(entry["word"], row, col, across=slot.direction == DIR_ACROSS)
+            placed_entries.append(
+                {
+                    "word": entry["word"],
+                    "clue": entry.get("clue", ""),
+                    "category": entry.get("category", ""),
+                    "direction": slot.direction,
+                    "start": (row, col),
+                    "location_index": len(placed_entries) + 1,
+                }
+            )
+            return word_id
+        return None
+
+    def _slot_candidates(
+        self,
+        slot: CrossingSlot,
+        index: WordIndex,
+        allowed: int,
+        words: List[str],
+        word_weights: List[float],
+        board: CrosswordBoard,
+        min_length: int,
+        rng: random.Random,
+    ) -> Iterator[Tuple[int, int, int]]:
+        """Yield (word id, row, col) for legal fills of the slot; spans are shuffled, words weighted per span."""
+        across = slot.direction == DIR_ACROSS
+        line_length = board.cols if across else board.rows
+        cells = board.cells
+        # Flat index of offset 0 on the slot's line and the stride between consecutive offsets.
+        base = slot.line * board.cols if across else slot.line
+        step = 1 if across else board.cols
+
+        def occupied(offset: int) -> bool:
+            if offset < 0 or offset >= line_length:
+                return False
+            return cells[base + offset * step] != 0
+
+        # Every (start, end) span that crosses at least one fixed letter and is not glued to a neighbour.
+        spans: List[Tuple[int, int]] = []
+        for start in range(slot.lo, slot.hi - min_length + 2):
+            if occupied(start - 1):
+                continue
+            for end in range(start + min_length - 1, slot.hi + 1):
+                if occupied(end + 1):
+                    continue
+                if any(start <= offset <= end for offset, _ in slot.fixed):
+                    spans.append((start, end))
+        rng.shuffle(spans)
+
+        for start, end in spans:
+            length = end - start + 1
+            fixed = [(offset - start, letter) for offset, letter in slot.fixed if start <= offset <= end]
+            mask = index.matching(length, fixed) & allowed
+            if not mask:
+                continue
+            keyed: List[Tuple[float, int]] = []
+            for word_id in index.iter_ids(mask):
+                random_value = rng.random()
+                if random_value <= 0.0:
+                    random_value = 1e-6
+                keyed.append((math.pow(random_value, 1.0 / word_weights[word_id]), word_id))
+            keyed.sort(reverse=True)
+            for _, word_id in keyed:
+                word = words[word_id]
+                if across:
+                    if self._can_place_horizontal(word, slot.line, start, board):
+                        yield word_id, slot.line, start
+                elif self._can_place_vertical(word, start, slot.line, board):
+                    yield word_id, start, slot.line
+
+    def _open_slots(self, board: CrosswordBoard, min_length: int) -> List[CrossingSlot]:
+        rows = board.rows
+        cols = board.cols
+        cells = board.cells
+        across_flags = board.across
+        down_flags = board.down
+        slots: Dict[Tuple[Direction, int, int, int], CrossingSlot] = {}
+
+        def usable_across(index: int, r: int) -> bool:
+            if not cells[index]:
+                return (r == 0 or not cells[index - cols]) and (r + 1 >= rows or not cells[index + cols])
+            return bool(down_flags[index]) and not across_flags[index]
+
+        def usable_down(index: int, c: int) -> bool:
+            if not cells[index]:
+                return (c == 0 or not cells[index - 1]) and (c + 1 >= cols or not cells[index + 1])
+            return bool(across_flags[index]) and not down_flags[index]
+
+        for r in range(rows):
+            for c in range(cols):
+                index = r * cols + c
+                if not cells[index]:
+                    continue
+                if down_flags[index] and not across_flags[index]:
+                    lo = c
+                    while lo > 0 and usable_across(index - (c - lo) - 1, r):
+                        lo -= 1
+                    hi = c
+                    while hi + 1 < cols and usable_across(index + (hi - c) + 1, r):
+                        hi += 1
+                    key = (DIR_ACROSS, r, lo, hi)
+                    if hi - lo + 1 >= min_length and key not in slots:
+                        fixed = tuple((x, board.letter(r, x)) for x in range(lo, hi + 1) if cells[r * cols + x])
+                        slots[key] = CrossingSlot(r, DIR_ACROSS, lo, hi, fixed)
+                elif across_flags[index] and not down_flags[index]:
+                    lo = r
+                    while lo > 0 and usable_down(index - (r - lo + 1) * cols, c):
+                        lo -= 1
+                    hi = r
+                    while hi + 1 < rows and usable_down(index + (hi - r + 1) * cols, c):
+                        hi += 1
+                    key = (DIR_DOWN, c, lo, hi)
+                    if hi - lo + 1 >= min_length and key not in slots:
+                        fixed = tuple((y, board.letter(y, c)) for y in range(lo, hi + 1) if cells[y * cols + c])
+                        slots[key] = CrossingSlot(c, DIR_DOWN, lo, hi, fixed)
+        return list(slots.values())
+
+    def _can_place_horizontal(self, word: str, row: int, col: int, board: CrosswordBoard) -> bool:
+        checks = self._checks
+        rows = board.rows
         if rows == 0:
+            checks[REJECT_BOUNDS] += 1
             return False
-        cols = len(board[0])
+        cols = board.cols
         if col < 0 or col + len(word) > cols:
+            checks[REJECT_BOUNDS] += 1
             return False
         if row < 0 or row >= rows:
+            checks[REJECT_BOUNDS] += 1
             return False
-        if col > 0 and board[row][col - 1] != "":
+        cells = board.cells
+        base = row * cols
+        if col > 0 and cells[base + col - 1]:
+            checks[REJECT_BLOCKED_END] += 1
             return False
         end_col = col + len(word)
-        if end_col < cols and board[row][end_col] != "":
+        if end_col < cols and cells[base + end_col]:
+            checks[REJECT_BLOCKED_END] += 1
             return False
 
+        across = board.across
+        down = board.down
         intersects = False
 
-        for i, letter in enumerate(word):
-            c = col + i
-            existing = board[row][c]
-            if existing and existing != letter:
+        for i, code in enumerate(board.encode(word)):
+            index = base + col + i
+            existing = cells[index]
+            if existing and existing != code:
+                checks[REJECT_LETTER_MISMATCH] += 1
                 return False
-            if horizontal_mask[row][c]:
+            if across[index]:
+                checks[REJECT_OVERLAP] += 1
                 return False
             if not existing:
-                if (row > 0 and board[row - 1][c] != "") or (
-                    row + 1 < rows and board[row + 1][c] != ""
-                ):
+                if (row > 0 and cells[index - cols]) or (row + 1 < rows and cells[index + cols]):
+                    checks[REJECT_ADJACENT] += 1
                     return False
             else:
-                if not vertical_mask[row][c]:
+                if not down[index]:
+                    checks[REJECT_OVERLAP] += 1
                     return False
                 intersects = True
+        checks[None if intersects else REJECT_NO_CROSSING] += 1
         return intersects
 
-    def _can_place_vertical(
-        self,
-        word: str,
-        row: int,
-        col: int,
-        board: List[List[str]],
-        horizontal_mask: List[List[bool]],
-        vertical_mask: List[List[bool]],
-    ) -> bool:
-        rows = len(board)
+    def _can_place_vertical(self, word: str, row: int, col: int, board: CrosswordBoard) -> bool:
+        checks = self._checks
+        rows = board.rows
         if rows == 0:
+            checks[REJECT_BOUNDS] += 1
             return False
-        cols = len(board[0])
+        cols = board.cols
         if col < 0 or col >= cols:
+            checks[REJECT_BOUNDS] += 1
             return False
         if row < 0 or row + len(word) > rows:
+            checks[REJECT_BOUNDS] += 1
             return False
-        if row > 0 and board[row - 1][col] != "":
+        cells = board.cells
+        if row > 0 and cells[(row - 1) * cols + col]:
+            checks[REJECT_BLOCKED_END] += 1
             return False
         end_row = row + len(word)
-        if end_row < rows and board[end_row][col] != "":
+        if end_row < rows and cells[end_row * cols + col]:
+            checks[REJECT_BLOCKED_END] += 1
             return False
 
+        across = board.across
+        down = board.down
         intersects = False
 
-        for i, letter in enumerate(word):
-            r = row + i
-            existing = board[r][col]
-            if existing and existing != letter:
+        for i, code in enumerate(board.encode(word)):
+            index = (row + i) * cols + col
+            existing = cells[index]
+            if existing and existing != code:
+                checks[REJECT_LETTER_MISMATCH] += 1
                 return False
-            if vertical_mask[r][col]:
+            if down[index]:
+                checks[REJECT_OVERLAP] += 1
                 return False
             if not existing:
-                if (col > 0 and board[r][col - 1] != "") or (
-                    col + 1 < cols and board[r][col + 1] != ""
-                ):
+                if (col > 0 and cells[index - 1]) or (col + 1 < cols and cells[index + 1]):
+                    checks[REJECT_ADJACENT] += 1
                     return False
             else:
-                if not horizontal_mask[r][col]:
+                if not across[index]:
+                    checks[REJECT_OVERLAP] += 1
                     return False
                 intersects = True
+        checks[None if intersects else REJECT_NO_CROSSING] += 1
         return intersects
 
-    def _place_horizontal(
-        self,
-        word: str,
-        row: int,
-        col: int,
-        board: List[List[str]],
-        horizontal_mask: List[List[bool]],
-        letter_positions: Dict[str, List[Position]],
-    ) -> None:
-        for i, letter in enumerate(word):
-            c = col + i
-            existing = board[row][c]
-            if not existing:
-                board[row][c] = letter
-                self._record_letter(letter_positions, letter, (row, c))
-            horizontal_mask[row][c] = True
-
-    def _place_vertical(
-        self,
-        word: str,
-        row: int,
-        col: int,
-        board: List[List[str]],
-        vertical_mask: List[List[bool]],
-        letter_positions: Dict[str, List[Position]],
-    ) -> None:
-        for i, letter in enumerate(word):
-            r = row + i
-            existing = board[r][col]
-            if not existing:
-                board[r][col] = letter
-                self._record_letter(letter_positions, letter, (r, col))
-            vertical_mask[r][col] = True
-
-    def _record_letter(
-        self,
-        letter_positions: Dict[str, List[Position]],
-        letter: str,
-        pos: Position,
-    ) -> None:
-        letter_positions.setdefault(letter, []).append(pos)
+    def _place_horizontal(self, word: str, row: int, col: int, board: CrosswordBoard) -> None:
+        board.place(word, row, col, across=True)
 
-    def _create_matrix(self, rows: int, cols: int, default_value: Any) -> List[List[Any]]:
-        return [[default_value for _ in range(cols)] for _ in range(rows)]
+    def _place_vertical(self, word: str, row: int, col: int, board: CrosswordBoard) -> None:
+        board.place(word, row, col, across=False)
 
     def _build_layout_result(
-        self, board: List[List[str]], entries: List[EntryDict]
+        self, grid: CrosswordBoard, entries: List[EntryDict]
     ) -> Optional[PuzzleLayout]:
+        board = grid.to_rows()
         rows = len(board)
         if rows == 0:
             return None
@@ -456,7 +1132,7 @@ class CrosswordPuzzleGenerator:
         for r in range(rows):
             for c in range(cols):
                 if board[r][c] == "":
-                    board[r][c] = "#"
+                    board[r][c] = BLOCK
 
         bounds = self._find_letter_bounds(board)
         if bounds is None:
@@ -471,7 +1147,7 @@ class CrosswordPuzzleGenerator:
             for c in range(min_col, max_col + 1):
                 value = board[r][c]
                 row_array.append(value)
-                mask_row_chars.append("." if value != "#" else "#")
+                mask_row_chars.append("." if value != BLOCK else BLOCK)
             trimmed_board.append(row_array)
             trimmed_mask.append("".join(mask_row_chars))
 
@@ -497,7 +1173,7 @@ class CrosswordPuzzleGenerator:
         for r in range(rows):
             for c in range(cols):
                 value = board[r][c]
-                if value == "#" or value == "":
+                if value == BLOCK or value == "":
                     continue
                 if r < min_row:
                     min_row = r
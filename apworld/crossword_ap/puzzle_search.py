@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from .placement_scorer import SCORER_PYTHON
+from .puzzle_generator import (
+    ENGINE_WORD,
+    GENERATOR_VERSION,
+    PLACEMENT_FIRST,
+    BacktrackBudget,
+    CandidateTable,
+    CrosswordPuzzleGenerator,
+    PuzzleLayout,
+)
+from .stats import GenerationStats
+from .wordlist import get_word_corpus
+
+SEARCH_SIZES: Tuple[int, ...] = (15, 17, 19, 21, 23)
+ATTEMPTS_PER_SIZE = 120
+MIN_WORD_LENGTH = 3
+
+# Where a SearchResult's layout came from.
+SOURCE_SEARCH = "search"
+SOURCE_CACHE = "cache"
+SOURCE_POOL = "pool"
+SOURCE_CATALOG = "catalog"
+
+# (grid size, generator seed) for one generate() call.
+Attempt = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class SearchRequest:
+    """Everything one world needs searched; see search_layout for the meaning of each field."""
+
+    excluded_categories: FrozenSet[str]
+    target: int
+    attempts: Tuple[Attempt, ...]
+    category_weights: Dict[str, float]
+    engine: str = ENGINE_WORD
+    backtrack: Optional[BacktrackBudget] = None
+    placement: str = PLACEMENT_FIRST
+    # Only changes how fast placements are scored; both scorers give the same layouts.
+    scorer: str = SCORER_PYTHON
+    # Seconds this world's search may run, counted from when it starts; None for no limit.
+    time_budget: Optional[float] = None
+
+
+@dataclass
+class SearchResult:
+    layout: PuzzleLayout
+    seed: int
+    exact: bool
+    # Position of the winning attempt in the plan and its grid size.
+    attempt: int
+    size: int
+    # Counters for the whole search, not for the returned attempt alone: every attempt consumed up to
+    # and including an exact hit, or, for a closest layout, every attempt consumed before the plan
+    # (or the time limit) ran out, including the ones after the attempt that produced it.
+    stats: GenerationStats = field(default_factory=GenerationStats)
+    # True if the time limit stopped the search before the plan ran out.
+    degraded: bool = False
+    # SOURCE_SEARCH, or where the layout was looked up instead of searched.
+    source: str = SOURCE_SEARCH
+    # The generator that produced the layout; older than GENERATOR_VERSION only for pooled layouts,
+    # None for published puzzles from the .puz catalog.
+    generator_version: Optional[int] = GENERATOR_VERSION
+
+
+def plan_attempts(
+    rng: random.Random,
+    sizes: Sequence[int] = SEARCH_SIZES,
+    attempts_per_size: int = ATTEMPTS_PER_SIZE,
+) -> List[Attempt]:
+    """
+    Draw every attempt seed up front, in search order.
+
+    The seeds come from a private RNG seeded with a single draw from rng, so the world RNG advances
+    by the same amount however long the plan is and whichever attempt succeeds, and the chosen
+    puzzle is the same no matter how many workers run the plan.
+    """
+    plan_rng = random.Random(rng.getrandbits(64))
+    return [(size, plan_rng.getrandbits(32)) for size in sizes for _ in range(attempts_per_size)]
+
+
+_tables: Dict[Tuple[FrozenSet[str], Tuple[Tuple[str, float], ...]], CandidateTable] = {}
+_tables_lock = threading.Lock()
+
+
+def candidate_table(excluded_categories: FrozenSet[str], category_weights: Dict[str, float]) -> CandidateTable:
+    """
+    The CandidateTable for a corpus subset and weights, built once per process and shared by every
+    attempt (and every world) that asks for the same combination.
+    """
+    word_entries = get_word_corpus().without_categories(excluded_categories)
+    key = (excluded_categories, tuple(sorted(category_weights.items())))
+    with _tables_lock:
+        table = _tables.get(key)
+        # A reloaded word list hands out new subsets; rebuild rather than serve stale entries.
+        if table is None or table.source is not word_entries:
+            table = _tables[key] = CandidateTable(word_entries, MIN_WORD_LENGTH, category_weights)
+        return table
+
+
+def run_attempt(
+    excluded_categories: FrozenSet[str],
+    target: int,
+    category_weights: Dict[str, float],
+    size: int,
+    seed: int,
+    engine: str = ENGINE_WORD,
+    backtrack: Optional[BacktrackBudget] = None,
+    placement: str = PLACEMENT_FIRST,
+    scorer: str = SCORER_PYTHON,
+) -> Tuple[Optional[PuzzleLayout], GenerationStats]:
+    """Run a single generate() call; module level so worker processes can pickle it."""
+    table = candidate_table(excluded_categories, category_weights)
+    generator = CrosswordPuzzleGenerator(random.Random(seed), engine, backtrack, scorer, placement)
+    generator.stats.count_attempt(size)
+    layout = generator.generate(
+        table.source,
+        rows=size,
+        cols=size,
+        min_length=MIN_WORD_LENGTH,
+        max_words=target,
+        seed=seed,
+        category_weights=category_weights,
+        table=table,
+    )
+    return layout, generator.stats
+
+
+def search_layout(
+    excluded_categories: Iterable[str],
+    target: int,
+    attempts: Sequence[Attempt],
+    category_weights: Dict[str, float],
+    engine: str = ENGINE_WORD,
+    workers: int = 0,
+    executor: Optional[Executor] = None,
+    backtrack: Optional[BacktrackBudget] = None,
+    placement: str = PLACEMENT_FIRST,
+    deadline: Optional[float] = None,
+    scorer: str = SCORER_PYTHON,
+) -> Optional[SearchResult]:
+    """
+    Run the attempts in plan order and return the first layout with exactly `target` entries.
+
+    If none hits the target, the first layout closest to it is returned instead, or None if every
+    attempt failed. With more than one worker (or a caller-supplied executor) the attempts run in
+    parallel, but results are still consumed in plan order so the outcome matches a serial search.
+    A backtrack budget lets each attempt repair itself when it stalls short of the target,
+    placement picks the word engine's placement policy and scorer how its placements are scored.
+
+    Once time.monotonic() passes `deadline` the search stops at the next attempt boundary and
+    returns the closest layout so far, marked degraded. It keeps going until it has some layout,
+    so a deadline never turns a search that would succeed into a failure.
+    """
+    excluded = frozenset(excluded_categories)
+    if executor is None and workers <= 1:
+        return _search_serial(
+            excluded, target, attempts, category_weights, engine, backtrack, placement, scorer, deadline
+        )
+    if executor is not None:
+        return _search_parallel(
+            executor,
+            max(1, workers),
+            excluded,
+            target,
+            attempts,
+            category_weights,
+            engine,
+            backtrack,
+            placement,
+            scorer,
+            deadline,
+        )
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        return _search_parallel(
+            pool,
+            workers,
+            excluded,
+            target,
+            attempts,
+            category_weights,
+            engine,
+            backtrack,
+            placement,
+            scorer,
+            deadline,
+        )
+    finally:
+        # Attempts still queued after a hit are dropped rather than waited on.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def search_layouts(
+    requests: Sequence[SearchRequest],
+    workers: int = 0,
+    time_budget: Optional[float] = None,
+) -> List[Optional[SearchResult]]:
+    """
+    Search layouts for several worlds at once, sharing the corpus subsets and a single worker pool.
+
+    Each request is still consumed in its own plan order, so every world gets the same layout it
+    would get from search_layout on its own, unless a time limit runs out. `time_budget` caps the
+    whole batch in seconds, on top of each request's own time_budget.
+    """
+    batch_deadline = None if time_budget is None else time.monotonic() + time_budget
+    for request in requests:
+        # Build the shared subsets, their indexes and candidate tables once, before any worker forks.
+        candidate_table(request.excluded_categories, request.category_weights)
+
+    def run(request: SearchRequest, executor: Optional[Executor] = None) -> Optional[SearchResult]:
+        deadline = batch_deadline
+        if request.time_budget is not None:
+            own_deadline = time.monotonic() + request.time_budget
+            deadline = own_deadline if deadline is None else min(deadline, own_deadline)
+        return search_layout(
+            request.excluded_categories,
+            request.target,
+            request.attempts,
+            request.category_weights,
+            engine=request.engine,
+            workers=workers,
+            executor=executor,
+            backtrack=request.backtrack,
+            placement=request.placement,
+            deadline=deadline,
+            scorer=request.scorer,
+        )
+
+    if workers <= 1 or len(requests) <= 1:
+        return [run(request) for request in requests]
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # One driver thread per world keeps the pool busy across worlds instead of one world at a time.
+        with ThreadPoolExecutor(max_workers=min(len(requests), workers)) as drivers:
+            return list(drivers.map(lambda request: run(request, pool), requests))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _search_serial(
+    excluded: FrozenSet[str],
+    target: int,
+    attempts: Sequence[Attempt],
+    category_weights: Dict[str, float],
+    engine: str,
+    backtrack: Optional[BacktrackBudget],
+    placement: str,
+    scorer: str,
+    deadline: Optional[float],
+) -> Optional[SearchResult]:
+    stats = GenerationStats()
+    best: Optional[SearchResult] = None
+    best_difference = 0
+    for index, (size, seed) in enumerate(attempts):
+        if _out_of_time(best, deadline):
+            return best
+        layout, attempt_stats = run_attempt(
+            excluded, target, category_weights, size, seed, engine, backtrack, placement, scorer
+        )
+        stats.merge(attempt_stats)
+        if layout is None:
+            continue
+        difference = abs(target - len(layout.entries))
+        if difference == 0:
+            return SearchResult(layout, seed, True, index, size, stats)
+        if best is None or difference < best_difference:
+            best = SearchResult(layout, seed, False, index, size, stats)
+            best_difference = difference
+    return best
+
+
+def _search_parallel(
+    executor: Executor,
+    workers: int,
+    excluded: FrozenSet[str],
+    target: int,
+    attempts: Sequence[Attempt],
+    category_weights: Dict[str, float],
+    engine: str,
+    backtrack: Optional[BacktrackBudget],
+    placement: str,
+    scorer: str,
+    deadline: Optional[float],
+) -> Optional[SearchResult]:
+    # Keep a bounded window of attempts in flight so an early hit does not leave hundreds queued.
+    window = max(2, workers * 2)
+    pending: Dict[int, Future] = {}
+    # Only attempts consumed in plan order are counted, so the counters match a serial search.
+    stats = GenerationStats()
+    best: Optional[SearchResult] = None
+    best_difference = 0
+    next_submit = 0
+    try:
+        for index, (size, seed) in enumerate(attempts):
+            if _out_of_time(best, deadline):
+                return best
+            while next_submit < len(attempts) and next_submit < index + window:
+                submit_size, submit_seed = attempts[next_submit]
+                pending[next_submit] = executor.submit(
+                    run_attempt,
+                    excluded,
+                    target,
+                    category_weights,
+                    submit_size,
+                    submit_seed,
+                    engine,
+                    backtrack,
+                    placement,
+                    scorer,
+                )
+                next_submit += 1
+            layout, attempt_stats = pending.pop(index).result()
+            stats.merge(attempt_stats)
+            if layout is None:
+                continue
+            difference = abs(target - len(layout.entries))
+            if difference == 0:
+                return SearchResult(layout, seed, True, index, size, stats)
+            if best is None or difference < best_difference:
+                best = SearchResult(layout, seed, False, index, size, stats)
+                best_difference = difference
+    finally:
+        for future in pending.values():
+            future.cancel()
+    return best
+
+
+def _out_of_time(best: Optional[SearchResult], deadline: Optional[float]) -> bool:
+    """True once the deadline has passed and there is a layout to fall back on; marks it degraded."""
+    if best is None or deadline is None or time.monotonic() < deadline:
+        return False
+    best.degraded = True
+    best.stats.budget_expired = True
+    return True
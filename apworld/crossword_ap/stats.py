@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+# Why a _can_place_* check (or a whole word) was turned down.
+REJECT_BOUNDS = "bounds"
+REJECT_BLOCKED_END = "blocked_end"
+REJECT_LETTER_MISMATCH = "letter_mismatch"
+REJECT_OVERLAP = "overlap"
+REJECT_ADJACENT = "adjacent"
+REJECT_NO_CROSSING = "no_crossing"
+REJECT_NO_SHARED_LETTER = "no_shared_letter"
+
+# Phases timed by the generator (per attempt) and by the world (per player).
+PHASE_PREPARE = "prepare"
+PHASE_FILL = "fill"
+PHASE_BACKTRACK = "backtrack"
+PHASE_LAYOUT = "layout"
+PHASE_PLAN = "plan"
+PHASE_SEARCH = "search"
+
+
+@dataclass
+class GenerationStats:
+    """
+    Counters collected while generating layouts; one generate() call, a whole search or a player.
+
+    `attempts` counts generate() calls per grid size, `probes` the words (word engine) or slots
+    (slot engine and backtracking) a spot was looked for, `can_place_calls` the placement checks
+    run and `rejections` why they, or whole words, were turned down. `phase_seconds` is wall time
+    per phase; generator phases are summed over attempts, so with several workers they can add up
+    to more than the search phase itself. `budget_expired` is set when a search was cut short by
+    its time limit and settled for the best layout found so far.
+    """
+
+    attempts: Dict[int, int] = field(default_factory=dict)
+    probes: int = 0
+    can_place_calls: int = 0
+    rejections: Dict[str, int] = field(default_factory=dict)
+    phase_seconds: Dict[str, float] = field(default_factory=dict)
+    budget_expired: bool = False
+
+    def reject(self, reason: str, count: int = 1) -> None:
+        self.rejections[reason] = self.rejections.get(reason, 0) + count
+
+    def count_attempt(self, size: int) -> None:
+        self.attempts[size] = self.attempts.get(size, 0) + 1
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+
+    def merge(self, other: GenerationStats) -> None:
+        """Add other's counters into this one."""
+        for size, count in other.attempts.items():
+            self.attempts[size] = self.attempts.get(size, 0) + count
+        self.probes += other.probes
+        self.can_place_calls += other.can_place_calls
+        for reason, count in other.rejections.items():
+            self.rejections[reason] = self.rejections.get(reason, 0) + count
+        for phase, seconds in other.phase_seconds.items():
+            self.add_time(phase, seconds)
+        self.budget_expired = self.budget_expired or other.budget_expired
+
+    def as_dict(self) -> Dict[str, Any]:
+        # String keys throughout, so the result survives a JSON round trip unchanged.
+        return {
+            "attempts": {str(size): count for size, count in sorted(self.attempts.items())},
+            "probes": self.probes,
+            "can_place_calls": self.can_place_calls,
+            "rejections": dict(sorted(self.rejections.items())),
+            "phase_seconds": {phase: round(seconds, 4) for phase, seconds in self.phase_seconds.items()},
+            "budget_expired": self.budget_expired,
+        }
+
+    def summary(self) -> str:
+        """One-line human readable form for the generation log."""
+        attempts = " ".join(f"{size}x{count}" for size, count in sorted(self.attempts.items())) or "none"
+        rejected = sum(self.rejections.values())
+        reasons = ", ".join(
+            f"{reason} {count}" for reason, count in sorted(self.rejections.items(), key=lambda item: -item[1])
+        )
+        phases = " ".join(f"{phase} {seconds:.3f}s" for phase, seconds in self.phase_seconds.items())
+        return (
+            f"attempts {attempts}; probes {self.probes}; checks {self.can_place_calls}; "
+            f"rejected {rejected} ({reasons or 'none'}); {phases or 'no timings'}"
+            f"{'; time limit reached' if self.budget_expired else ''}"
+        )
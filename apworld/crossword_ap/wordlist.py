@@ -1,48 +1,191 @@
 from __future__ import annotations
 
+import logging
+import sys
+import threading
 from importlib import resources
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .corpus_artifact import ARTIFACT_RESOURCE, decode_artifact, encode_artifact, source_digest
 
 PACKAGE_NAME = __package__ or "crossword_ap"
+WORDLIST_RESOURCE = "crossword_wordlist.txt"
 FALLBACK_ASSET_PATH = Path(__file__).resolve().parents[2] / "assets" / "crossword_wordlist.txt"
 
 
+class WordEntry(NamedTuple):
+    """A single immutable word list record."""
+
+    word: str
+    clue: str
+    category: str
+
+
+class WordIndex:
+    """
+    Lookup tables over a fixed sequence of words, addressed by word id (the position in that sequence).
+
+    Word sets are stored as int bitsets (bit n set means word id n), so combining constraints is a
+    handful of integer ANDs regardless of corpus size.
+    """
+
+    __slots__ = ("by_length", "_length_masks", "_positional")
+
+    def __init__(self, words: Sequence[str]) -> None:
+        by_length: Dict[int, List[int]] = {}
+        length_masks: Dict[int, int] = {}
+        positional: Dict[Tuple[int, int, str], int] = {}
+        for word_id, word in enumerate(words):
+            bit = 1 << word_id
+            length = len(word)
+            by_length.setdefault(length, []).append(word_id)
+            length_masks[length] = length_masks.get(length, 0) | bit
+            for position, letter in enumerate(word):
+                key = (length, position, letter)
+                positional[key] = positional.get(key, 0) | bit
+        self.by_length: Dict[int, Tuple[int, ...]] = {
+            length: tuple(ids) for length, ids in sorted(by_length.items())
+        }
+        self._length_masks = length_masks
+        self._positional = positional
+
+    @classmethod
+    def from_tables(
+        cls,
+        by_length: Dict[int, Tuple[int, ...]],
+        length_masks: Dict[int, int],
+        positional: Dict[Tuple[int, int, str], int],
+    ) -> WordIndex:
+        """Wrap tables that were built ahead of time (see corpus_artifact) without re-indexing."""
+        index = cls.__new__(cls)
+        index.by_length = by_length
+        index._length_masks = length_masks
+        index._positional = positional
+        return index
+
+    def length_mask(self, length: int) -> int:
+        """Bitset of every word with the given length."""
+        return self._length_masks.get(length, 0)
+
+    def with_letter(self, length: int, position: int, letter: str) -> int:
+        """Bitset of words of the given length that have letter at the given offset."""
+        return self._positional.get((length, position, letter), 0)
+
+    def matching(self, length: int, fixed: Iterable[Tuple[int, str]]) -> int:
+        """Bitset of words of the given length that agree with every (offset, letter) pair in fixed."""
+        mask = self._length_masks.get(length, 0)
+        positional = self._positional
+        for position, letter in fixed:
+            if not mask:
+                break
+            mask &= positional.get((length, position, letter), 0)
+        return mask
+
+    @staticmethod
+    def iter_ids(mask: int) -> Iterator[int]:
+        """Yield the word ids contained in a bitset, lowest first."""
+        while mask:
+            lowest = mask & -mask
+            yield lowest.bit_length() - 1
+            mask ^= lowest
+
+
+class WordCorpus:
+    """
+    Immutable, shareable view over the parsed word list.
+
+    Instances are created once per process (see get_word_corpus) and handed to every world,
+    so nothing here may be mutated after construction.
+    """
+
+    __slots__ = ("entries", "categories", "index", "source_hash", "_subsets", "_lock")
+
+    def __init__(
+        self,
+        entries: Iterable[WordEntry],
+        index: Optional[WordIndex] = None,
+        source_hash: str = "",
+    ) -> None:
+        self.entries: Tuple[WordEntry, ...] = tuple(entries)
+        self.categories: Tuple[str, ...] = tuple(dict.fromkeys(entry.category for entry in self.entries))
+        # Word ids in the index are positions in self.entries.
+        self.index = index if index is not None else WordIndex([entry.word for entry in self.entries])
+        # SHA-256 of the word list text this corpus came from; subsets keep their parent's.
+        self.source_hash = source_hash
+        self._subsets: Dict[FrozenSet[str], WordCorpus] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[WordEntry]:
+        return iter(self.entries)
+
+    def __getitem__(self, index: int) -> WordEntry:
+        return self.entries[index]
+
+    def without_categories(self, excluded: Iterable[str]) -> WordCorpus:
+        """Return a (cached) corpus that skips every entry in the excluded categories."""
+        key = frozenset(excluded)
+        if not key:
+            return self
+        with self._lock:
+            subset = self._subsets.get(key)
+            if subset is None:
+                subset = WordCorpus(
+                    (entry for entry in self.entries if entry.category not in key),
+                    source_hash=self.source_hash,
+                )
+                self._subsets[key] = subset
+        return subset
+
+    def as_dicts(self) -> List[Dict[str, str]]:
+        return [entry._asdict() for entry in self.entries]
+
+
+_corpus: Optional[WordCorpus] = None
+_corpus_lock = threading.Lock()
+
+
 def _iter_lines(text: str) -> Iterable[str]:
     for raw_line in text.splitlines():
         yield raw_line.rstrip("\n")
 
 
-def _load_embedded_wordlist() -> List[str]:
+def _read_resource(name: str) -> Optional[bytes]:
     try:
-        data = resources.read_text(PACKAGE_NAME, "crossword_wordlist.txt", encoding="utf-8")
-    except (FileNotFoundError, UnicodeDecodeError):
-        return []
-    return list(_iter_lines(data))
+        return resources.read_binary(PACKAGE_NAME, name)
+    except (FileNotFoundError, OSError):
+        return None
+
 
+def _load_word_list_source() -> Optional[bytes]:
+    """Raw word list text, from the package or the client's asset folder."""
+    for source in (_read_resource(WORDLIST_RESOURCE), _read_external_wordlist()):
+        if not source:
+            continue
+        try:
+            source.decode("utf-8")
+        except UnicodeDecodeError:
+            continue
+        return source
+    return None
 
-def _load_external_wordlist() -> List[str]:
+
+def _read_external_wordlist() -> Optional[bytes]:
     if not FALLBACK_ASSET_PATH.exists():
-        return []
-    return list(_iter_lines(FALLBACK_ASSET_PATH.read_text(encoding="utf-8")))
+        return None
+    return FALLBACK_ASSET_PATH.read_bytes()
 
 
-def load_word_entries() -> List[Dict[str, str]]:
+def _parse_word_entries(lines: Iterable[str]) -> List[WordEntry]:
     """
-    Parse the crossword word list into dictionaries containing word/clue/category.
+    Parse the crossword word list into word/clue/category records.
 
     The parser mirrors the client implementation so both sides share the same data source.
     """
-    lines = _load_embedded_wordlist()
-    if not lines:
-        lines = _load_external_wordlist()
-    if not lines:
-        raise FileNotFoundError(
-            "Crossword word list not found in package resources "
-            f"or at {FALLBACK_ASSET_PATH}"
-        )
-
-    entries: List[Dict[str, str]] = []
+    entries: List[WordEntry] = []
     current_category = ""
     for raw_line in lines:
         line = raw_line.strip()
@@ -50,20 +193,99 @@ def load_word_entries() -> List[Dict[str, str]]:
             continue
         separator_index = line.find(":")
         if separator_index == -1:
-            current_category = line
+            current_category = sys.intern(line)
             continue
 
         lhs = line[:separator_index].strip()
         rhs = line[separator_index + 1 :].strip()
         if not rhs:
-            current_category = lhs
+            current_category = sys.intern(lhs)
             continue
 
-        entry = {
-            "word": lhs.upper(),
-            "clue": rhs,
-            "category": current_category,
-        }
-        entries.append(entry)
+        entries.append(WordEntry(lhs.upper(), rhs, current_category))
 
     return entries
+
+
+def get_word_corpus() -> WordCorpus:
+    """
+    Return the process-wide word corpus, loading it on first use.
+
+    Every world instance shares the same object, so the word list is read and parsed once per process.
+    """
+    global _corpus
+    corpus = _corpus
+    if corpus is not None:
+        return corpus
+    with _corpus_lock:
+        if _corpus is None:
+            _corpus = _load_corpus()
+        return _corpus
+
+
+def _load_corpus() -> WordCorpus:
+    source = _load_word_list_source()
+    artifact = _read_resource(ARTIFACT_RESOURCE)
+    if artifact is not None:
+        corpus = _corpus_from_artifact(artifact, source)
+        if corpus is not None:
+            return corpus
+    if source is None:
+        raise FileNotFoundError(
+            f"Crossword word list not found in package resources or at {FALLBACK_ASSET_PATH}"
+        )
+    return WordCorpus(_parse_word_entries(_iter_lines(source.decode("utf-8"))), source_hash=source_digest(source))
+
+
+def _corpus_from_artifact(artifact: bytes, source: Optional[bytes]) -> Optional[WordCorpus]:
+    """Corpus from the compiled artifact, or None if it is unreadable or older than the text word list."""
+    try:
+        tables = decode_artifact(artifact)
+    except ValueError as error:
+        logging.warning(f"Ignoring compiled CrosswordAP word list: {error}")
+        return None
+    if source is not None and tables.source_hash != source_digest(source):
+        logging.debug("Compiled CrosswordAP word list is stale; parsing the text word list instead.")
+        return None
+    categories = tables.categories
+    entries = [
+        WordEntry(word, clue, categories[category_id])
+        for word, clue, category_id in zip(tables.words, tables.clues, tables.category_ids)
+    ]
+    index = WordIndex.from_tables(tables.by_length, tables.length_masks, tables.positional)
+    return WordCorpus(entries, index, tables.source_hash)
+
+
+def compile_word_list(source: bytes) -> bytes:
+    """Compile word list text into the binary artifact that get_word_corpus prefers over parsing."""
+    entries = _parse_word_entries(_iter_lines(source.decode("utf-8")))
+    categories = list(dict.fromkeys(entry.category for entry in entries))
+    category_ids = {category: category_id for category_id, category in enumerate(categories)}
+    words = [entry.word for entry in entries]
+    index = WordIndex(words)
+    return encode_artifact(
+        source_digest(source),
+        words,
+        [entry.clue for entry in entries],
+        categories,
+        [category_ids[entry.category] for entry in entries],
+        index.by_length,
+        index._length_masks,
+        index._positional,
+    )
+
+
+def invalidate_word_corpus() -> None:
+    """Drop the cached corpus so the next get_word_corpus call reloads the word list (used by tests)."""
+    global _corpus
+    with _corpus_lock:
+        _corpus = None
+
+
+def load_word_entries() -> List[Dict[str, str]]:
+    """
+    Parse the crossword word list into dictionaries containing word/clue/category.
+
+    Kept for callers that expect mutable dictionaries; new code should use get_word_corpus.
+    """
+    return get_word_corpus().as_dicts()
@@ -1,20 +1,90 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Tuple
+import logging
+import os
+import sqlite3
+import time
+from typing import ClassVar, Dict, FrozenSet, List, Optional, Union
 
-from BaseClasses import Region, Item, ItemClassification
+import settings
+from BaseClasses import Region, Item, ItemClassification, MultiWorld
 from worlds.AutoWorld import WebWorld, World
 from worlds.generic.Rules import set_rule
 
+from .feasibility import SizeEstimate, describe_estimates, estimate_sizes, prune_attempts
 from .items import CLUE_ITEM_TABLE, CrosswordItem
+from .layout_cache import LayoutCache, search_layouts_cached
+from .layout_pool import load_layout_pool, pool_key
 from .locations import CLUE_LOCATION_TABLE, CrosswordLocation
-from .options import CrosswordOptions, ColorIndicator, option_groups
-from .puzzle_generator import CrosswordPuzzleGenerator, PuzzleLayout
-from .wordlist import load_word_entries
+from .options import CrosswordOptions, ColorIndicator, PlacementPolicy, option_groups
+from .placement_scorer import SCORER_NUMPY, SCORER_PYTHON, SCORERS, numpy_available
+from .puz_catalog import PuzCatalog, layout_from_puz
+from .puz_parser import PuzParseError, parse_puz_file, validate_puzzle_for_apworld
+from .puzzle_generator import GENERATOR_VERSION, PLACEMENT_BEST, PLACEMENT_FIRST, BacktrackBudget, PuzzleLayout
+from .puzzle_search import SEARCH_SIZES, SOURCE_CATALOG, SOURCE_SEARCH, SearchRequest, SearchResult, plan_attempts
+from .stats import PHASE_PLAN, PHASE_SEARCH, GenerationStats
+from .wordlist import get_word_corpus
 
 
 MIN_WORDS = 10
 MAX_WORDS = 30
+# Backtracking for attempts that stall a few words short of the target. Bounded by search steps only:
+# a wall-clock bound would make the puzzle depend on how fast the generating machine is.
+SEARCH_BACKTRACK = BacktrackBudget(max_nodes=400, max_seconds=None)
+
+
+class CrosswordAPSettings(settings.Group):
+    class GenerationWorkers(int):
+        """
+        Number of worker processes used to search for crossword layouts.
+        0 or 1 keeps the search on the generating process. The chosen puzzle does not depend on this value.
+        """
+
+    class GenerationTimeLimit(int):
+        """
+        Seconds all CrosswordAP puzzles in a multiworld may spend searching, together; 0 for no limit.
+        When it runs out each remaining puzzle settles for the closest layout found so far, so a seed
+        may then differ between machines. Players can set a tighter limit with generation_time_limit.
+        """
+
+    class LayoutCacheDirectory(settings.OptionalUserFolderPath):
+        """
+        Folder to keep generated crossword layouts in, so generating the same multiworld again skips
+        the search. Leave empty to disable the cache.
+        """
+
+    class LayoutCacheSize(int):
+        """Megabytes the layout cache may use; the least recently used layouts are removed past this."""
+
+    class LayoutCacheVerify(settings.Bool):
+        """Search even when a layout is cached and check that the cached one matches, replacing it if not."""
+
+    class LayoutPoolFile(settings.OptionalUserFilePath):
+        """
+        Layout pool built with tools/build_layout_pool.py. Players with use_layout_pool draw their
+        puzzle from it instead of searching. Leave empty if there is no pool.
+        """
+
+    class PuzzleCatalogFile(settings.OptionalUserFilePath):
+        """
+        Catalog of .puz files built with tools/ingest_puz.py. Players with use_puzzle_catalog play a
+        published puzzle from it instead of a generated one. Leave empty if there is no catalog.
+        """
+
+    class PlacementScorer(str):
+        """
+        How generation scores word placements: "python", or "numpy" for the vectorized scorer, which
+        needs NumPy installed. Both give the same puzzles; falls back to "python" without NumPy.
+        """
+
+    generation_workers: GenerationWorkers = GenerationWorkers(0)
+    generation_time_limit: GenerationTimeLimit = GenerationTimeLimit(0)
+    layout_cache_directory: LayoutCacheDirectory = LayoutCacheDirectory("")
+    layout_cache_size: LayoutCacheSize = LayoutCacheSize(64)
+    layout_cache_verify: Union[LayoutCacheVerify, bool] = False
+    layout_pool_file: LayoutPoolFile = LayoutPoolFile("")
+    puzzle_catalog_file: PuzzleCatalogFile = PuzzleCatalogFile("")
+    placement_scorer: PlacementScorer = PlacementScorer(SCORER_PYTHON)
 
 
 class CrosswordAPWeb(WebWorld):
@@ -31,17 +101,24 @@ class CrosswordAPWorld(World):
 
     options_dataclass = CrosswordOptions
     options: CrosswordOptions
+    settings: ClassVar[CrosswordAPSettings]
     item_name_to_id = CLUE_ITEM_TABLE
     location_name_to_id = CLUE_LOCATION_TABLE
     _puzzle_layout: Optional[PuzzleLayout]
     _puzzle_seed: Optional[int]
+    _generator_version: Optional[int]
     _actual_clue_total: Optional[int]
+    _size_estimates: List[SizeEstimate]
+    _generation_stats: GenerationStats
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self._puzzle_layout = None
         self._puzzle_seed = None
+        self._generator_version = GENERATOR_VERSION
         self._actual_clue_total = None
+        self._size_estimates = []
+        self._generation_stats = GenerationStats()
         self._distributed_clue_count = 0
 
     def _compute_clue_item_count(self) -> int:
@@ -149,18 +226,22 @@ class CrosswordAPWorld(World):
         layout_dict: Dict = {}
         entry_count = 0
         if self._puzzle_layout:
-            layout_dict = self._puzzle_layout.as_dict()
-            entry_count = len(layout_dict.get("entries", []))
+            if self.options.compact_layout.value:
+                layout_dict = self._puzzle_layout.as_compact_dict()
+            else:
+                layout_dict = self._puzzle_layout.as_dict()
+            entry_count = len(self._puzzle_layout.entries)
         slot_total = self._total_words()
         indicator_mode = int(self.options.color_indicator.value)
         indicator_enabled = indicator_mode == ColorIndicator.option_start_with
         starting_hints = int(self.options.starting_letter_hints.value)
         hints_enabled = bool(self.options.letter_hints_enabled.value)
-        return {
+        slot_data = {
             "total_words": slot_total,
             "initial_clues": min(slot_total, self.options.initial_clues.value),
             "puzzle_layout": layout_dict,
             "puzzle_seed": self._puzzle_seed,
+            "generator_version": self._generator_version,
             "entry_count": entry_count,
             "clue_item_count": self._distributed_clue_count,
             "completion_location": CLUE_LOCATION_TABLE["Crossword Completed"],
@@ -169,6 +250,9 @@ class CrosswordAPWorld(World):
             "letter_hints_enabled": hints_enabled,
             "starting_letter_hints": starting_hints,
         }
+        if self.options.include_generation_stats.value:
+            slot_data["generation_stats"] = self._generation_stats.as_dict()
+        return slot_data
 
     def _total_words(self) -> int:
         if self._actual_clue_total is not None:
@@ -181,48 +265,209 @@ class CrosswordAPWorld(World):
         if self._puzzle_layout is not None:
             return
 
-        word_entries = load_word_entries()
-        # Filter out disabled difficulty categories
-        word_entries = self._filter_by_difficulty(word_entries)
-        
-        generator = CrosswordPuzzleGenerator(self.random)
+        # Normally already done in stage_generate_early; this covers worlds created outside that flow.
+        pooled = self._catalog_result() or self._pooled_result()
+        if pooled is not None:
+            self._apply_search_result(pooled, 0.0)
+            return
+        request = self._search_request()
+        started = time.perf_counter()
+        results = search_layouts_cached(
+            [request],
+            self._layout_cache(),
+            workers=int(self.settings.generation_workers),
+            time_budget=self._host_time_limit(),
+        )
+        self._apply_search_result(results[0], time.perf_counter() - started)
+
+    @classmethod
+    def stage_generate_early(cls, multiworld: MultiWorld) -> None:
+        """Generate every CrosswordAP puzzle in the multiworld as one batch sharing corpus and workers."""
+        worlds = []
+        for world in multiworld.get_game_worlds(cls.game):
+            if world._puzzle_layout is not None:
+                continue
+            pooled = world._catalog_result() or world._pooled_result()
+            if pooled is not None:
+                world._apply_search_result(pooled, 0.0)
+            else:
+                worlds.append(world)
+        if not worlds:
+            return
+        requests = [world._search_request() for world in worlds]
+        started = time.perf_counter()
+        results = search_layouts_cached(
+            requests,
+            cls._layout_cache(),
+            workers=int(cls.settings.generation_workers),
+            time_budget=cls._host_time_limit(),
+        )
+        # The batch runs worlds side by side, so each is charged the whole batch's wall time.
+        elapsed = time.perf_counter() - started
+        for world, result in zip(worlds, results):
+            world._apply_search_result(result, elapsed)
+
+    @classmethod
+    def _host_time_limit(cls) -> Optional[float]:
+        limit = int(cls.settings.generation_time_limit)
+        return float(limit) if limit > 0 else None
+
+    @classmethod
+    def _placement_scorer(cls) -> str:
+        scorer = str(cls.settings.placement_scorer or SCORER_PYTHON).strip().lower()
+        if scorer not in SCORERS:
+            raise ValueError(f"Unknown CrosswordAP placement_scorer {scorer!r}; expected one of {SCORERS}")
+        if scorer == SCORER_NUMPY and not numpy_available():
+            logging.warning("CrosswordAP: placement_scorer is numpy but NumPy is not installed; using python")
+            return SCORER_PYTHON
+        return scorer
+
+    @classmethod
+    def _layout_cache(cls) -> Optional[LayoutCache]:
+        directory = str(cls.settings.layout_cache_directory or "")
+        if not directory:
+            return None
+        return LayoutCache(
+            os.path.expanduser(directory),
+            max_bytes=int(cls.settings.layout_cache_size) * 1024 * 1024,
+            verify=bool(cls.settings.layout_cache_verify),
+        )
+
+    def _pooled_result(self) -> Optional[SearchResult]:
+        """A layout drawn from the host's layout pool with self.random, if the player asked for one."""
+        if not self.options.use_layout_pool.value:
+            return None
+        path = str(self.settings.layout_pool_file or "")
+        if not path:
+            logging.warning(f"CrosswordAP player {self.player}: no layout pool is configured; searching instead")
+            return None
+        try:
+            pool = load_layout_pool(os.path.expanduser(path))
+        except (OSError, ValueError) as error:
+            logging.warning(f"CrosswordAP player {self.player}: could not read layout pool {path}: {error}")
+            return None
+        key = pool_key(self._total_words(), self._excluded_categories())
+        result = pool.draw(key, self.random)
+        if result is None:
+            logging.warning(f"CrosswordAP player {self.player}: layout pool has no {key!r} layouts; searching instead")
+        return result
+
+    def _catalog_result(self) -> Optional[SearchResult]:
+        """A published puzzle picked from the host's .puz catalog with self.random, if the player asked for one."""
+        if not self.options.use_puzzle_catalog.value:
+            return None
+        path = str(self.settings.puzzle_catalog_file or "")
+        if not path:
+            logging.warning(
+                f"CrosswordAP player {self.player}: no puzzle catalog is configured; generating instead"
+            )
+            return None
+        requested = self._total_words()
+        try:
+            with PuzCatalog(os.path.expanduser(path), read_only=True) as catalog:
+                counts = catalog.word_counts()
+                # The closest word count, the smaller one on a tie.
+                count = min(counts, key=lambda value: (abs(value - requested), value), default=None)
+                entries = catalog.find(count) if count is not None else []
+        except (ValueError, sqlite3.Error) as error:
+            logging.warning(f"CrosswordAP player {self.player}: could not read puzzle catalog {path}: {error}")
+            return None
+        if not entries:
+            logging.warning(
+                f"CrosswordAP player {self.player}: puzzle catalog has no valid puzzles; generating instead"
+            )
+            return None
+        entry = self.random.choice(entries)
+        try:
+            puzzle = parse_puz_file(entry.path)
+        except PuzParseError as error:
+            logging.warning(
+                f"CrosswordAP player {self.player}: could not load {entry.path}: {error}; generating instead"
+            )
+            return None
+        # The file may have changed since it was cataloged.
+        valid, reason = validate_puzzle_for_apworld(puzzle)
+        if not valid:
+            logging.warning(
+                f"CrosswordAP player {self.player}: {entry.path} is no longer playable: {reason}; "
+                "generating instead"
+            )
+            return None
+        logging.info(
+            f"CrosswordAP player {self.player}: playing {entry.title or entry.path!r} "
+            f"by {entry.author or 'unknown'}"
+        )
+        layout = layout_from_puz(puzzle)
+        return SearchResult(
+            layout,
+            0,
+            len(layout.entries) == requested,
+            0,
+            max(puzzle.width, puzzle.height),
+            source=SOURCE_CATALOG,
+            # Published, not generated.
+            generator_version=None,
+        )
+
+    def _search_request(self) -> SearchRequest:
+        started = time.perf_counter()
+        excluded = self._excluded_categories()
         target = self._total_words()
-        min_length = 3
-        attempts_per_size = 120
-        sizes = [15, 17, 19, 21, 23]
-        best: Optional[Tuple[int, PuzzleLayout, int]] = None  # (difference, layout, seed)
-
-        for size in sizes:
-            for _ in range(attempts_per_size):
-                seed = self.random.getrandbits(32)
-                layout = generator.generate(
-                    word_entries,
-                    rows=size,
-                    cols=size,
-                    min_length=min_length,
-                    max_words=target,
-                    seed=seed,
-                    category_weights=self._default_category_weights(),
-                )
-                if layout is None:
-                    continue
-                entry_count = len(layout.entries)
-                difference = abs(target - entry_count)
-                if entry_count == target:
-                    self._puzzle_layout = layout
-                    self._puzzle_seed = seed
-                    self._actual_clue_total = entry_count
-                    return
-                if best is None or difference < best[0]:
-                    best = (difference, layout, seed)
-
-        if best is None:
+        weights = self._default_category_weights()
+        # The whole plan is drawn from self.random up front, so the result does not depend on the worker count.
+        attempts = plan_attempts(self.random)
+        # Skip grid sizes the word list cannot fill to the target and cap attempts on the rest. This
+        # decides which puzzle a seed gets, and can leave a world on its closest layout (see prune_attempts).
+        corpus = get_word_corpus().without_categories(excluded)
+        self._size_estimates = estimate_sizes(corpus, target, SEARCH_SIZES, weights)
+        best = int(self.options.placement_policy.value) == PlacementPolicy.option_best
+        request = SearchRequest(
+            excluded,
+            target,
+            tuple(prune_attempts(attempts, self._size_estimates)),
+            weights,
+            backtrack=SEARCH_BACKTRACK,
+            placement=PLACEMENT_BEST if best else PLACEMENT_FIRST,
+            scorer=self._placement_scorer(),
+            time_budget=float(self.options.generation_time_limit.value) or None,
+        )
+        self._generation_stats.add_time(PHASE_PLAN, time.perf_counter() - started)
+        return request
+
+    def _apply_search_result(self, result: Optional[SearchResult], search_seconds: float) -> None:
+        if result is None:
             raise RuntimeError("Failed to generate a crossword puzzle with the available word list.")
 
-        _, layout, seed = best
-        self._puzzle_layout = layout
-        self._puzzle_seed = seed
-        self._actual_clue_total = len(layout.entries)
+        stats = self._generation_stats
+        stats.merge(result.stats)
+        stats.add_time(PHASE_SEARCH, search_seconds)
+        logging.debug(
+            f"CrosswordAP player {self.player}: size estimates "
+            f"{describe_estimates(self._size_estimates, result.size if result.exact else None)}"
+        )
+        if result.source != SOURCE_SEARCH:
+            logging.info(
+                f"CrosswordAP player {self.player}: {'exact' if result.exact else 'closest'} "
+                f"{len(result.layout.entries)}-word layout on {result.size}x{result.size} "
+                f"from the layout {result.source}"
+            )
+        else:
+            logging.info(
+                f"CrosswordAP player {self.player}: {'exact' if result.exact else 'closest'} "
+                f"{len(result.layout.entries)}-word layout on {result.size}x{result.size} "
+                f"after {result.attempt + 1} attempts; {stats.summary()}"
+            )
+        if result.degraded:
+            logging.warning(
+                f"CrosswordAP player {self.player}: generation time limit reached, using a "
+                f"{len(result.layout.entries)}-word puzzle instead of {self._total_words()} words."
+            )
+
+        # Whether it was searched here, in a worker or read from a cache, slot data pickles the same.
+        self._puzzle_layout = result.layout.interned()
+        self._puzzle_seed = result.seed
+        self._generator_version = result.generator_version
+        self._actual_clue_total = len(result.layout.entries)
 
     @staticmethod
     def _default_category_weights() -> Dict[str, float]:
@@ -233,8 +478,8 @@ class CrosswordAPWorld(World):
             "_default": 1.0,
         }
 
-    def _filter_by_difficulty(self, word_entries: List[Dict]) -> List[Dict]:
-        """Filter word entries based on difficulty toggles."""
+    def _excluded_categories(self) -> FrozenSet[str]:
+        """Word list categories disabled by the difficulty toggles."""
         excluded_categories = set()
         
         if not self.options.include_easy_words.value:
@@ -244,10 +489,4 @@ class CrosswordAPWorld(World):
         if not self.options.include_hard_words.value:
             excluded_categories.add("HARD WORDS")
         
-        if not excluded_categories:
-            return word_entries
-        
-        return [
-            entry for entry in word_entries
-            if entry.get("category", "") not in excluded_categories
-        ]
+        return frozenset(excluded_categories)
@@ -0,0 +1,218 @@
+"""
+Minimal stand-ins for the Archipelago modules the CrosswordAP world imports.
+
+Development tools (benchmarks, regression checks) use these to load the world without a full
+Archipelago checkout. When the real modules are importable they are used instead.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import types
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+APWORLD_DIR = Path(__file__).resolve().parents[1]
+
+
+def install() -> None:
+    """Make `import crossword_ap` work, stubbing Archipelago modules only if they are missing."""
+    if str(APWORLD_DIR) not in sys.path:
+        sys.path.insert(0, str(APWORLD_DIR))
+    try:
+        import BaseClasses  # noqa: F401
+        import Options  # noqa: F401
+        import settings  # noqa: F401
+        import worlds.AutoWorld  # noqa: F401
+        return
+    except ImportError:
+        pass
+    for name in list(sys.modules):
+        if name in ("BaseClasses", "Options", "settings") or name == "worlds" or name.startswith("worlds."):
+            del sys.modules[name]
+    sys.modules.update(
+        {
+            "BaseClasses": _base_classes(),
+            "Options": _options(),
+            "settings": _settings(),
+            **_worlds(),
+        }
+    )
+
+
+def make_world(
+    seed: int,
+    options: Optional[Dict[str, Any]] = None,
+    settings: Optional[Dict[str, Any]] = None,
+    player: int = 1,
+):
+    """Build a CrosswordAPWorld with the given option values, ready for _ensure_puzzle_generated."""
+    import crossword_ap
+    from crossword_ap import options as crossword_options
+
+    world_cls = crossword_ap.CrosswordAPWorld
+    world_cls.settings = types.SimpleNamespace(**{**default_settings(), **(settings or {})})
+    world = world_cls(types.SimpleNamespace(), player)
+    world.random = random.Random(seed)
+
+    values = dict(options or {})
+    option_values = types.SimpleNamespace()
+    for name, option_type in crossword_options.CrosswordOptions.__annotations__.items():
+        option_cls = getattr(crossword_options, option_type) if isinstance(option_type, str) else option_type
+        value = values.pop(name, option_cls.default)
+        setattr(option_values, name, option_cls(value))
+    if values:
+        raise KeyError(f"Unknown CrosswordAP options: {sorted(values)}")
+    crossword_options.CrosswordOptions.__post_init__(option_values)
+    world.options = option_values
+    return world
+
+
+def default_settings() -> Dict[str, Any]:
+    """Host settings defaults, read from the world's settings group."""
+    # crossword_ap re-exports the world class as `world`, shadowing the submodule attribute.
+    group = sys.modules["crossword_ap.world"].CrosswordAPSettings
+    return {name: getattr(group, name) for name in getattr(group, "__annotations__", {})}
+
+
+def _base_classes() -> types.ModuleType:
+    module = types.ModuleType("BaseClasses")
+
+    class ItemClassification:
+        filler = 0
+        progression = 1
+        useful = 2
+
+    class Item:
+        def __init__(self, name: str, classification: int, code: Optional[int], player: int) -> None:
+            self.name = name
+            self.classification = classification
+            self.code = code
+            self.player = player
+
+    class Location:
+        def __init__(self, player: int, name: str = "", address: Optional[int] = None, parent=None) -> None:
+            self.player = player
+            self.name = name
+            self.address = address
+            self.parent_region = parent
+
+    class Region:
+        def __init__(self, name: str, player: int, multiworld) -> None:
+            self.name = name
+            self.player = player
+            self.locations = []
+
+        def connect(self, other: "Region") -> None:
+            pass
+
+    module.Item = Item
+    module.ItemClassification = ItemClassification
+    module.Location = Location
+    module.Region = Region
+    module.MultiWorld = object
+    return module
+
+
+def _options() -> types.ModuleType:
+    module = types.ModuleType("Options")
+
+    class Option:
+        default: Any = 0
+
+        def __init__(self, value: Any = None) -> None:
+            self.value = self.default if value is None else value
+
+    class Range(Option):
+        range_start = 0
+        range_end = 1
+
+    class Toggle(Option):
+        pass
+
+    class DefaultOnToggle(Toggle):
+        default = 1
+
+    class Choice(Option):
+        pass
+
+    class FreeText(Option):
+        default = ""
+
+    class OptionGroup:
+        def __init__(self, name: str, options, *args, **kwargs) -> None:
+            self.name = name
+            self.options = options
+
+    class PerGameCommonOptions:
+        pass
+
+    for name, value in {
+        "Option": Option,
+        "Range": Range,
+        "Toggle": Toggle,
+        "DefaultOnToggle": DefaultOnToggle,
+        "Choice": Choice,
+        "FreeText": FreeText,
+        "OptionGroup": OptionGroup,
+        "PerGameCommonOptions": PerGameCommonOptions,
+    }.items():
+        setattr(module, name, value)
+    return module
+
+
+def _settings() -> types.ModuleType:
+    module = types.ModuleType("settings")
+
+    class Group:
+        def __getitem__(self, key: str) -> Any:
+            return getattr(self, key)
+
+    class Bool:
+        pass
+
+    module.Group = Group
+    module.Bool = Bool
+    for name in (
+        "UserFilePath",
+        "UserFolderPath",
+        "OptionalUserFilePath",
+        "OptionalUserFolderPath",
+        "LocalFilePath",
+        "LocalFolderPath",
+        "OptionalLocalFilePath",
+        "OptionalLocalFolderPath",
+    ):
+        setattr(module, name, type(name, (str,), {}))
+    return module
+
+
+def _worlds() -> Dict[str, types.ModuleType]:
+    worlds = types.ModuleType("worlds")
+    worlds.__path__ = []
+    auto_world = types.ModuleType("worlds.AutoWorld")
+
+    class WebWorld:
+        pass
+
+    class World:
+        settings: Any = None
+
+        def __init__(self, multiworld, player: int) -> None:
+            self.multiworld = multiworld
+            self.player = player
+            self.random = random.Random()
+
+    auto_world.WebWorld = WebWorld
+    auto_world.World = World
+    generic = types.ModuleType("worlds.generic")
+    generic.__path__ = []
+    rules = types.ModuleType("worlds.generic.Rules")
+    rules.set_rule = lambda *args, **kwargs: None
+    return {
+        "worlds": worlds,
+        "worlds.AutoWorld": auto_world,
+        "worlds.generic": generic,
+        "worlds.generic.Rules": rules,
+    }
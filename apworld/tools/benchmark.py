@@ -0,0 +1,361 @@
+"""
+Benchmark the CrosswordAP puzzle generator and the world's layout search.
+
+Runs without an Archipelago checkout (see ap_stubs) and prints a JSON report:
+
+    python apworld/tools/benchmark.py --quick
+    python apworld/tools/benchmark.py --suite generator --sizes 15,23 --runs 50 --output bench.json
+
+The `generator` suite times single CrosswordPuzzleGenerator.generate calls over grid size x word
+target x difficulty x category weights x placement policy. The `world` suite times the full
+_ensure_puzzle_generated flow (planning, feasibility pruning and search) over word target x
+difficulty. Both report layout density: crossings per word and the share of the trimmed board's
+bounding box holding letters.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import ap_stubs
+
+ap_stubs.install()
+
+from crossword_ap.puzzle_generator import (  # noqa: E402
+    BLOCK,
+    ENGINE_SLOT,
+    ENGINE_WORD,
+    CandidateTable,
+    CrosswordPuzzleGenerator,
+    PuzzleLayout,
+)
+from crossword_ap.puzzle_search import MIN_WORD_LENGTH, SEARCH_SIZES  # noqa: E402
+from crossword_ap.stats import GenerationStats  # noqa: E402
+from crossword_ap.wordlist import get_word_corpus, invalidate_word_corpus  # noqa: E402
+
+CATEGORIES = {"easy": "EASY WORDS", "medium": "MEDIUM WORDS", "hard": "HARD WORDS"}
+
+DIFFICULTIES: Tuple[str, ...] = ("easy", "medium", "hard", "easy+medium", "easy+medium+hard")
+TARGETS: Tuple[int, ...] = (10, 15, 20, 25, 30)
+
+WEIGHT_PROFILES: Dict[str, Dict[str, float]] = {
+    # Mirrors CrosswordAPWorld._default_category_weights.
+    "default": {"EASY WORDS": 0.7, "MEDIUM WORDS": 1.2, "HARD WORDS": 0.7, "_default": 1.0},
+    "uniform": {"_default": 1.0},
+    "hard-heavy": {"EASY WORDS": 0.5, "MEDIUM WORDS": 1.0, "HARD WORDS": 2.0, "_default": 1.0},
+}
+
+QUICK = {
+    "sizes": (15, 23),
+    "targets": (10, 20, 30),
+    "difficulties": ("easy", "easy+medium+hard"),
+    "weights": ("default",),
+    "runs": 5,
+    "world_runs": 2,
+}
+
+
+def percentile(samples: Sequence[float], fraction: float) -> Optional[float]:
+    """Linearly interpolated percentile; None for no samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, Optional[float]]:
+    millis = [value * 1000.0 for value in seconds]
+    return {
+        "mean_ms": _round(sum(millis) / len(millis)) if millis else None,
+        "p50_ms": _round(percentile(millis, 0.50)),
+        "p95_ms": _round(percentile(millis, 0.95)),
+        "p99_ms": _round(percentile(millis, 0.99)),
+        "max_ms": _round(max(millis)) if millis else None,
+    }
+
+
+def peak_memory(run: Callable[[], Any]) -> int:
+    """Peak bytes allocated by Python while run() executes."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def layout_density(layout: PuzzleLayout) -> Tuple[float, float]:
+    """(crossings per word, letter cells / bounding box cells) of a trimmed layout."""
+    letters = sum(cell != BLOCK for row in layout.board for cell in row)
+    crossings = sum(len(entry["word"]) for entry in layout.entries) - letters
+    area = len(layout.board) * len(layout.board[0])
+    return crossings / len(layout.entries), letters / area
+
+
+def density_summary(layouts: Sequence[PuzzleLayout]) -> Dict[str, Optional[float]]:
+    densities = [layout_density(layout) for layout in layouts]
+    return {
+        "crossings_per_word": _round(sum(d[0] for d in densities) / len(densities)) if densities else None,
+        "bbox_density": _round(sum(d[1] for d in densities) / len(densities)) if densities else None,
+    }
+
+
+def excluded_for(difficulty: str) -> frozenset:
+    enabled = {CATEGORIES[name] for name in difficulty.split("+")}
+    return frozenset(CATEGORIES.values()) - enabled
+
+
+def difficulty_options(difficulty: str) -> Dict[str, int]:
+    enabled = set(difficulty.split("+"))
+    return {f"include_{name}_words": int(name in enabled) for name in CATEGORIES}
+
+
+def bench_generator(
+    sizes: Sequence[int],
+    targets: Sequence[int],
+    difficulties: Sequence[str],
+    weights: Sequence[str],
+    placements: Sequence[str],
+    runs: int,
+    seed: int,
+    engine: str,
+    memory: bool,
+) -> List[Dict[str, Any]]:
+    corpus = get_word_corpus()
+    cells: List[Dict[str, Any]] = []
+    for difficulty in difficulties:
+        entries = corpus.without_categories(excluded_for(difficulty))
+        tables = {
+            profile: CandidateTable(entries, MIN_WORD_LENGTH, WEIGHT_PROFILES[profile]) for profile in weights
+        }
+        for profile, placement, size, target in itertools.product(weights, placements, sizes, targets):
+            category_weights = WEIGHT_PROFILES[profile]
+            # Seeds ignore the policy so both policies see the same attempts.
+            rng = random.Random(f"{seed}:{difficulty}:{profile}:{size}:{target}")
+            seeds = [rng.getrandbits(32) for _ in range(runs)]
+
+            counters = GenerationStats()
+
+            def attempt(attempt_seed: int):
+                generator = CrosswordPuzzleGenerator(random.Random(attempt_seed), engine, placement=placement)
+                generator.stats.count_attempt(size)
+                try:
+                    return generator.generate(
+                        entries,
+                        rows=size,
+                        cols=size,
+                        min_length=MIN_WORD_LENGTH,
+                        max_words=target,
+                        seed=attempt_seed,
+                        category_weights=category_weights,
+                        table=tables[profile],
+                    )
+                finally:
+                    counters.merge(generator.stats)
+
+            timings: List[float] = []
+            placed: List[int] = []
+            layouts: List[PuzzleLayout] = []
+            hits = 0
+            first_hit: Optional[int] = None
+            for index, attempt_seed in enumerate(seeds):
+                start = time.perf_counter()
+                layout = attempt(attempt_seed)
+                timings.append(time.perf_counter() - start)
+                count = len(layout.entries) if layout else 0
+                placed.append(count)
+                if layout:
+                    layouts.append(layout)
+                if count == target:
+                    hits += 1
+                    if first_hit is None:
+                        first_hit = index + 1
+            cell: Dict[str, Any] = {
+                "difficulty": difficulty,
+                "weights": profile,
+                "placement": placement,
+                "size": size,
+                "target": target,
+                "runs": runs,
+                "success_rate": _round(hits / runs) if runs else None,
+                # Expected generate() calls per exact layout, and where the first one landed.
+                "attempts_to_success": _round(runs / hits) if hits else None,
+                "first_success": first_hit,
+                "mean_words": _round(sum(placed) / len(placed)) if placed else None,
+                **density_summary(layouts),
+                **latency_summary(timings),
+                "counters": counters.as_dict(),
+            }
+            if memory and seeds:
+                cell["peak_memory_kib"] = _round(peak_memory(lambda: attempt(seeds[0])) / 1024)
+            cells.append(cell)
+            _progress(cell)
+    return cells
+
+
+def bench_world(
+    targets: Sequence[int],
+    difficulties: Sequence[str],
+    runs: int,
+    seed: int,
+    memory: bool,
+) -> List[Dict[str, Any]]:
+    cells: List[Dict[str, Any]] = []
+    for difficulty in difficulties:
+        for target in targets:
+            options = {"total_words": target, **difficulty_options(difficulty)}
+            rng = random.Random(f"{seed}:world:{difficulty}:{target}")
+            seeds = [rng.getrandbits(32) for _ in range(runs)]
+
+            def ensure(world_seed: int):
+                world = ap_stubs.make_world(world_seed, options)
+                world._ensure_puzzle_generated()
+                return world
+
+            timings: List[float] = []
+            attempts: List[int] = []
+            layouts: List[PuzzleLayout] = []
+            sizes: Counter = Counter()
+            exact = 0
+            for world_seed in seeds:
+                start = time.perf_counter()
+                world = ensure(world_seed)
+                timings.append(time.perf_counter() - start)
+                counters = world._generation_stats
+                attempts.append(sum(counters.attempts.values()))
+                layouts.append(world._puzzle_layout)
+                if len(world._puzzle_layout.entries) == target:
+                    exact += 1
+                    # Sizes are searched in increasing order, so an exact hit came from the largest one tried.
+                    sizes[str(max(counters.attempts))] += 1
+                else:
+                    sizes["closest"] += 1
+            cell: Dict[str, Any] = {
+                "difficulty": difficulty,
+                "target": target,
+                "runs": runs,
+                "success_rate": _round(exact / runs) if runs else None,
+                "attempts_to_success": {
+                    "mean": _round(sum(attempts) / len(attempts)) if attempts else None,
+                    "p50": _round(percentile(attempts, 0.50)),
+                    "max": max(attempts) if attempts else None,
+                },
+                "sizes": dict(sorted(sizes.items())),
+                **density_summary(layouts),
+                **latency_summary(timings),
+            }
+            if memory and seeds:
+                cell["peak_memory_kib"] = _round(peak_memory(lambda: ensure(seeds[0])) / 1024)
+            cells.append(cell)
+            _progress(cell)
+    return cells
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 3)
+
+
+def _progress(cell: Dict[str, Any]) -> None:
+    keys = ("difficulty", "weights", "placement", "size", "target")
+    label = " ".join(f"{key}={cell[key]}" for key in keys if key in cell)
+    print(
+        f"{label}: success={cell['success_rate']} crossings/word={cell['crossings_per_word']} "
+        f"density={cell['bbox_density']} p50={cell['p50_ms']}ms p95={cell['p95_ms']}ms",
+        file=sys.stderr,
+    )
+
+
+def _csv(cast: Callable[[str], Any]) -> Callable[[str], Tuple[Any, ...]]:
+    return lambda text: tuple(cast(part) for part in text.split(",") if part)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--suite", choices=("generator", "world", "all"), default="all")
+    parser.add_argument("--sizes", type=_csv(int), default=SEARCH_SIZES)
+    parser.add_argument("--targets", type=_csv(int), default=TARGETS)
+    parser.add_argument("--difficulties", type=_csv(str), default=DIFFICULTIES)
+    parser.add_argument("--weights", type=_csv(str), default=tuple(WEIGHT_PROFILES))
+    parser.add_argument(
+        "--placements",
+        type=_csv(str),
+        default=CrosswordPuzzleGenerator.PLACEMENTS,
+        help="word engine placement policies",
+    )
+    parser.add_argument("--runs", type=int, default=20, help="generate() calls per generator cell")
+    parser.add_argument("--world-runs", type=int, default=5, help="world seeds per world cell")
+    parser.add_argument("--engine", choices=(ENGINE_WORD, ENGINE_SLOT), default=ENGINE_WORD)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak memory runs")
+    parser.add_argument("--quick", action="store_true", help="small matrix for a smoke run")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        for key, value in QUICK.items():
+            setattr(args, key, value)
+    for name in args.difficulties:
+        if any(part not in CATEGORIES for part in name.split("+")):
+            parser.error(f"unknown difficulty {name!r}; combine {', '.join(CATEGORIES)} with '+'")
+    for name in args.placements:
+        if name not in CrosswordPuzzleGenerator.PLACEMENTS:
+            choices = ", ".join(CrosswordPuzzleGenerator.PLACEMENTS)
+            parser.error(f"unknown placement policy {name!r}; choose from {choices}")
+    for name in args.weights:
+        if name not in WEIGHT_PROFILES:
+            parser.error(f"unknown weight profile {name!r}; choose from {', '.join(WEIGHT_PROFILES)}")
+
+    invalidate_word_corpus()
+    start = time.perf_counter()
+    corpus = get_word_corpus()
+    corpus_seconds = time.perf_counter() - start
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "arguments": {key: value for key, value in vars(args).items() if key != "output"},
+        },
+        "corpus": {"entries": len(corpus), "load_ms": _round(corpus_seconds * 1000.0)},
+    }
+    memory = not args.no_memory
+    if args.suite in ("generator", "all"):
+        report["generator"] = bench_generator(
+            args.sizes,
+            args.targets,
+            args.difficulties,
+            args.weights,
+            args.placements,
+            args.runs,
+            args.seed,
+            args.engine,
+            memory,
+        )
+    if args.suite in ("world", "all"):
+        report["world"] = bench_world(args.targets, args.difficulties, args.world_runs, args.seed, memory)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Pack apworld/crossword_ap into apworld/crossword_ap.apworld.
+
+The compiled word list (crossword_wordlist.bin) ships inside the .apworld next to the text it was
+compiled from, so the build refuses to pack a missing or stale artifact; run compile_corpus.py first:
+
+    python apworld/tools/compile_corpus.py
+    python apworld/tools/build_apworld.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import zipfile
+from pathlib import Path
+from typing import Optional, Sequence
+
+import ap_stubs
+import compile_corpus
+
+PACKAGE_DIR = ap_stubs.APWORLD_DIR / "crossword_ap"
+# Files never packed: bytecode caches and editor or OS leftovers.
+EXCLUDED_DIRS = {"__pycache__"}
+EXCLUDED_SUFFIXES = {".pyc", ".pyo", ".tmp"}
+# Fixed timestamp so packing the same tree twice gives identical bytes.
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+
+def packed_files(package: Path) -> list:
+    return sorted(
+        path
+        for path in package.rglob("*")
+        if path.is_file()
+        and not EXCLUDED_DIRS.intersection(path.relative_to(package).parts)
+        and path.suffix not in EXCLUDED_SUFFIXES
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", type=Path, default=ap_stubs.APWORLD_DIR / "crossword_ap.apworld")
+    args = parser.parse_args(argv)
+
+    if compile_corpus.main(["--check"]) != 0:
+        return 1
+    files = packed_files(PACKAGE_DIR)
+    with zipfile.ZipFile(args.output, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path in files:
+            name = f"{PACKAGE_DIR.name}/{path.relative_to(PACKAGE_DIR).as_posix()}"
+            info = zipfile.ZipInfo(name, ZIP_TIMESTAMP)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, path.read_bytes())
+    print(f"Wrote {args.output}: {len(files)} files, {args.output.stat().st_size} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Pre-generate a pool of exact layouts per (total words, difficulty) combination.
+
+Each layout comes from the same search a world runs, seeded per pool entry, and only layouts that
+hit the word count exactly are kept. Point the host's crossword_ap_options.layout_pool_file at the
+output; players with use_layout_pool then draw from it instead of searching:
+
+    python apworld/tools/build_layout_pool.py --output crossword_layouts.pool
+    python apworld/tools/build_layout_pool.py --targets 20,25 --difficulties easy+medium --count 200 \\
+        --output crossword_layouts.pool --append
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import ap_stubs
+
+ap_stubs.install()
+
+from crossword_ap.layout_pool import LayoutPool, pool_key  # noqa: E402
+from crossword_ap.puzzle_search import search_layouts  # noqa: E402
+from crossword_ap.wordlist import get_word_corpus  # noqa: E402
+from crossword_ap.world import MAX_WORDS, MIN_WORDS  # noqa: E402
+
+DIFFICULTIES = ("easy", "medium", "hard")
+# Seeds tried per pooled layout before a combination is given up on.
+MAX_TRIES_PER_LAYOUT = 4
+BATCH = 16
+
+
+def all_difficulties() -> Tuple[str, ...]:
+    """Every non-empty combination of the difficulty toggles, e.g. "easy+hard"."""
+    return tuple(
+        "+".join(combination)
+        for size in range(1, len(DIFFICULTIES) + 1)
+        for combination in itertools.combinations(DIFFICULTIES, size)
+    )
+
+
+def difficulty_options(difficulty: str) -> Dict[str, int]:
+    enabled = set(difficulty.split("+"))
+    return {f"include_{name}_words": int(name in enabled) for name in DIFFICULTIES}
+
+
+def fill_pool(
+    pool: LayoutPool,
+    target: int,
+    difficulty: str,
+    count: int,
+    seed: int,
+    workers: int,
+) -> Tuple[str, int]:
+    """Add up to `count` new exact layouts for one combination; returns its key and how many were added."""
+    options = {"total_words": target, **difficulty_options(difficulty)}
+    seeds = random.Random(f"{seed}:{target}:{difficulty}")
+    probe = ap_stubs.make_world(0, options)
+    # The same key the world looks its pool up by.
+    key = pool_key(probe._total_words(), probe._excluded_categories())
+    seen: Set[str] = {json.dumps(record["layout"], sort_keys=True) for record in pool.pools.get(key, ())}
+    added = 0
+    tries = 0
+    while added < count and tries < count * MAX_TRIES_PER_LAYOUT:
+        worlds = [ap_stubs.make_world(seeds.getrandbits(64), options) for _ in range(BATCH)]
+        tries += len(worlds)
+        results = search_layouts([world._search_request() for world in worlds], workers=workers)
+        for result in results:
+            if result is None or not result.exact or added >= count:
+                continue
+            fingerprint = json.dumps(result.layout.as_compact_dict(), sort_keys=True)
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            pool.add(key, result)
+            added += 1
+    return key, added
+
+
+def _csv(cast: Callable[[str], Any]) -> Callable[[str], Tuple[Any, ...]]:
+    return lambda text: tuple(cast(part) for part in text.split(",") if part)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--targets", type=_csv(int), default=tuple(range(MIN_WORDS, MAX_WORDS + 1)))
+    parser.add_argument("--difficulties", type=_csv(str), default=all_difficulties())
+    parser.add_argument("--count", type=int, default=32, help="layouts per combination")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--append", action="store_true", help="add to the layouts already in --output")
+    args = parser.parse_args(argv)
+    for name in args.difficulties:
+        if any(part not in DIFFICULTIES for part in name.split("+")):
+            parser.error(f"unknown difficulty {name!r}; combine {', '.join(DIFFICULTIES)} with '+'")
+    for target in args.targets:
+        if not MIN_WORDS <= target <= MAX_WORDS:
+            parser.error(f"total words must be between {MIN_WORDS} and {MAX_WORDS}, got {target}")
+
+    corpus_hash = get_word_corpus().source_hash
+    pool = LayoutPool(corpus_hash=corpus_hash)
+    if args.append and args.output.exists():
+        # Each new record carries this generator's version; the pool's own version stays the one
+        # its older, unversioned records were made with.
+        pool = LayoutPool.decode(args.output.read_bytes())
+        pool.corpus_hash = corpus_hash
+
+    started = time.perf_counter()
+    short: List[str] = []
+    for target in args.targets:
+        for difficulty in args.difficulties:
+            key, added = fill_pool(pool, target, difficulty, args.count, args.seed, args.workers)
+            print(f"{key}: +{added} ({pool.count(key)} pooled)", file=sys.stderr)
+            if added < args.count:
+                short.append(key)
+
+    data = pool.encode()
+    args.output.write_bytes(data)
+    print(
+        f"Wrote {args.output}: {len(pool)} layouts in {len(pool.pools)} pools, {len(data)} bytes, "
+        f"{time.perf_counter() - started:.1f}s",
+        file=sys.stderr,
+    )
+    if short:
+        print(f"Fewer than {args.count} new layouts for: {', '.join(short)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
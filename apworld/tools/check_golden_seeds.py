@@ -0,0 +1,184 @@
+"""
+Check that fixed seeds still produce the recorded puzzles.
+
+Regenerating an existing multiworld must give every player the same crossword, so the generator
+may only change its output together with a GENERATOR_VERSION bump. This runs a fixed set of
+generate() calls (each engine and placement policy, with and without backtracking, and the NumPy
+scorer when installed) and of whole world generations through _ensure_puzzle_generated, and
+compares a hash of each result with golden_seeds.json:
+
+    python apworld/tools/check_golden_seeds.py              # exit 1 on any difference
+    python apworld/tools/check_golden_seeds.py --workers 4  # same results with a worker pool
+    python apworld/tools/check_golden_seeds.py --record     # after bumping GENERATOR_VERSION
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import ap_stubs
+
+ap_stubs.install()
+
+from crossword_ap.placement_scorer import SCORER_NUMPY, SCORER_PYTHON, numpy_available  # noqa: E402
+from crossword_ap.puzzle_generator import (  # noqa: E402
+    ENGINE_SLOT,
+    ENGINE_WORD,
+    GENERATOR_VERSION,
+    PLACEMENT_BEST,
+    PLACEMENT_FIRST,
+    BacktrackBudget,
+    CrosswordPuzzleGenerator,
+    PuzzleLayout,
+)
+from crossword_ap.puzzle_search import MIN_WORD_LENGTH  # noqa: E402
+from crossword_ap.wordlist import get_word_corpus  # noqa: E402
+from crossword_ap.world import CrosswordAPWorld  # noqa: E402
+
+GOLDEN_FILE = Path(__file__).resolve().parent / "golden_seeds.json"
+
+GENERATE_SEEDS = range(4)
+# (grid size, target words)
+GENERATE_SIZES = ((11, 12), (11, 25), (15, 12), (15, 25))
+# Sizes where attempts stall within max_shortfall words of the target, so backtracking actually runs.
+BACKTRACK_SIZES = ((13, 22), (14, 24), (14, 26))
+# (engine, placement, backtrack, sizes); backtracking is bounded by nodes only, a time bound would not repeat.
+GENERATE_MODES = (
+    (ENGINE_WORD, PLACEMENT_FIRST, None, GENERATE_SIZES),
+    (ENGINE_WORD, PLACEMENT_BEST, None, GENERATE_SIZES),
+    (ENGINE_WORD, PLACEMENT_FIRST, BacktrackBudget(max_nodes=200), BACKTRACK_SIZES),
+    (ENGINE_SLOT, PLACEMENT_FIRST, None, GENERATE_SIZES),
+)
+
+WORLD_SEEDS = range(3)
+WORLD_OPTIONS: Tuple[Dict[str, int], ...] = (
+    {},
+    {"total_words": 10},
+    {"total_words": 30},
+    {"total_words": 20, "include_hard_words": 1},
+    {"total_words": 25, "include_easy_words": 0, "include_medium_words": 0},
+    {"placement_policy": 1},
+)
+
+
+def digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def layout_value(layout: Optional[PuzzleLayout]) -> Any:
+    return None if layout is None else layout.as_dict()
+
+
+def generate_cases() -> Iterator[Tuple[str, str, str, Optional[BacktrackBudget], int, int, int]]:
+    for engine, placement, backtrack, sizes in GENERATE_MODES:
+        mode = f"{engine}/{placement}" + ("/backtrack" if backtrack else "")
+        for size, target in sizes:
+            for seed in GENERATE_SEEDS:
+                case = f"{mode} {size}x{size} {target} words seed {seed}"
+                yield case, engine, placement, backtrack, size, target, seed
+
+
+def run_generate() -> List[Tuple[str, str]]:
+    """(case, hash) for every generate() case; word engine cases run once per available scorer."""
+    corpus = get_word_corpus()
+    weights = CrosswordAPWorld._default_category_weights()
+    scorers = [SCORER_PYTHON] + ([SCORER_NUMPY] if numpy_available() else [])
+    results = []
+    for case, engine, placement, backtrack, size, target, seed in generate_cases():
+        for scorer in scorers if engine == ENGINE_WORD else [SCORER_PYTHON]:
+            generator = CrosswordPuzzleGenerator(random.Random(seed), engine, backtrack, scorer, placement)
+            layout = generator.generate(corpus, size, size, MIN_WORD_LENGTH, target, seed, weights)
+            label = case if scorer == SCORER_PYTHON else f"{case} ({scorer} scorer)"
+            results.append((label, digest(layout_value(layout))))
+    return results
+
+
+def run_worlds(workers: int) -> List[Tuple[str, str]]:
+    """(case, hash) for every world case; the hash covers the layout, its seed and the RNG state after."""
+    results = []
+    for options in WORLD_OPTIONS:
+        for seed in WORLD_SEEDS:
+            world = ap_stubs.make_world(seed, options, settings={"generation_workers": workers})
+            world._ensure_puzzle_generated()
+            value = {
+                "layout": layout_value(world._puzzle_layout),
+                "seed": world._puzzle_seed,
+                "next_random": world.random.getrandbits(64),
+            }
+            described = ",".join(f"{name}={setting}" for name, setting in sorted(options.items())) or "defaults"
+            results.append((f"world {described} seed {seed}", digest(value)))
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--golden", type=Path, default=GOLDEN_FILE)
+    parser.add_argument("--workers", type=int, default=0, help="generation_workers for the world cases")
+    parser.add_argument("--record", action="store_true", help="rewrite the golden file from this generator")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    generate = run_generate()
+    worlds = run_worlds(args.workers)
+    elapsed = time.perf_counter() - started
+    corpus_hash = get_word_corpus().source_hash
+
+    if args.record:
+        # Scorer variants must match the plain case, so only the plain ones are recorded.
+        document = {
+            "generator_version": GENERATOR_VERSION,
+            "corpus": corpus_hash,
+            "generate": {case: value for case, value in generate if not case.endswith("scorer)")},
+            "world": dict(worlds),
+        }
+        args.golden.write_text(json.dumps(document, indent=1, sort_keys=True) + "\n")
+        print(f"Recorded {len(document['generate']) + len(worlds)} cases to {args.golden} ({elapsed:.1f}s)")
+        return 0
+
+    golden = json.loads(args.golden.read_text())
+    expected: Dict[str, str] = {**golden["generate"], **golden["world"]}
+    mismatches = []
+    missing = []
+    for case, value in generate + worlds:
+        want = expected.get(case.replace(f" ({SCORER_NUMPY} scorer)", ""))
+        if want is None:
+            missing.append(case)
+        elif want != value:
+            mismatches.append(case)
+    print(
+        f"{len(generate) + len(worlds)} cases in {elapsed:.1f}s, "
+        f"{len(mismatches)} differ, {len(missing)} not recorded"
+    )
+    for case in mismatches[:10]:
+        print(f"  differs: {case}", file=sys.stderr)
+    for case in missing[:10]:
+        print(f"  not recorded: {case}", file=sys.stderr)
+    if golden["corpus"] != corpus_hash:
+        print("The word list changed since the golden set was recorded.", file=sys.stderr)
+    if not mismatches:
+        return 1 if missing else 0
+    if golden["generator_version"] == GENERATOR_VERSION:
+        print(
+            f"Generator output changed but GENERATOR_VERSION is still {GENERATOR_VERSION}; existing seeds "
+            "would regenerate differently. Fix the change, or bump GENERATOR_VERSION and --record.",
+            file=sys.stderr,
+        )
+    else:
+        print(
+            f"Golden set is for generator version {golden['generator_version']}, this is "
+            f"{GENERATOR_VERSION}; re-record with --record.",
+            file=sys.stderr,
+        )
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
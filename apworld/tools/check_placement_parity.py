@@ -0,0 +1,94 @@
+"""
+Check that the NumPy placement scorer accepts exactly the placements the pure-Python path accepts.
+
+Boards are rebuilt from generated layouts at several fill levels and every word of the corpus is
+scored on each; both scorers must return identical ranked lists. Needs NumPy installed:
+
+    python apworld/tools/check_placement_parity.py --seeds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import List, Optional, Sequence
+
+import ap_stubs
+
+ap_stubs.install()
+
+from crossword_ap.board import CrosswordBoard  # noqa: E402
+from crossword_ap.placement_scorer import SCORER_NUMPY, numpy_available  # noqa: E402
+from crossword_ap.puzzle_generator import DIR_ACROSS, CrosswordPuzzleGenerator, PuzzleLayout  # noqa: E402
+from crossword_ap.wordlist import get_word_corpus  # noqa: E402
+
+SIZES = (9, 15, 23)
+FILL_LEVELS = (2, 8, 20, 30)
+MARGIN = 2
+
+
+def board_from_layout(layout: PuzzleLayout, size: int, rng: random.Random) -> CrosswordBoard:
+    """Rebuild a layout's placements on a size x size board, at a random offset with some margin."""
+    rows = len(layout.board)
+    cols = len(layout.board[0])
+    board = CrosswordBoard(max(size, rows + MARGIN), max(size, cols + MARGIN))
+    top = rng.randrange(board.rows - rows + 1)
+    left = rng.randrange(board.cols - cols + 1)
+    for entry in layout.entries:
+        row, col = entry["start"]
+        board.place(entry["word"], row + top, col + left, across=entry["direction"] == DIR_ACROSS)
+    return board
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=10)
+    args = parser.parse_args(argv)
+    if not numpy_available():
+        print("NumPy is not installed; nothing to compare.", file=sys.stderr)
+        return 2
+
+    corpus = get_word_corpus()
+    words = sorted({entry.word for entry in corpus})
+    reference = CrosswordPuzzleGenerator(random.Random(0))
+    vectorized = CrosswordPuzzleGenerator(random.Random(0), scorer=SCORER_NUMPY)
+    boards = 0
+    placements = 0
+    mismatches: List[str] = []
+    timings = {"python": 0.0, "numpy": 0.0}
+    for seed in range(args.seeds):
+        for size in SIZES:
+            for target in FILL_LEVELS:
+                layout = CrosswordPuzzleGenerator(random.Random(seed)).generate(
+                    corpus, size, size, 3, target, seed, None
+                )
+                if layout is None:
+                    continue
+                board = board_from_layout(layout, size, random.Random(seed))
+                boards += 1
+                for word in words:
+                    start = time.perf_counter()
+                    expected = reference._legal_placements(word, board)
+                    middle = time.perf_counter()
+                    actual = vectorized._legal_placements(word, board)
+                    timings["python"] += middle - start
+                    timings["numpy"] += time.perf_counter() - middle
+                    placements += len(expected)
+                    if actual != expected:
+                        mismatches.append(f"seed {seed} size {size} fill {target} word {word}")
+
+    scored = boards * len(words)
+    print(f"{boards} boards, {scored} words scored, {placements} legal placements")
+    for name, seconds in timings.items():
+        print(f"{name}: {seconds * 1e6 / max(1, scored):.1f} us per word")
+    if mismatches:
+        print(f"{len(mismatches)} mismatches, first: {mismatches[0]}", file=sys.stderr)
+        return 1
+    print("Both scorers agree.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
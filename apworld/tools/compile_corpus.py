@@ -0,0 +1,57 @@
+"""
+Compile crossword_ap/crossword_wordlist.txt into crossword_ap/crossword_wordlist.bin.
+
+Run after editing the word list, before building the .apworld with build_apworld.py:
+
+    python apworld/tools/compile_corpus.py          # rewrite the artifact
+    python apworld/tools/compile_corpus.py --check  # exit 1 if the artifact is missing or stale
+
+A stale artifact is never used (the world falls back to parsing the text), so forgetting this
+step only costs load time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+import ap_stubs
+
+ap_stubs.install()
+
+from crossword_ap.corpus_artifact import ARTIFACT_RESOURCE, decode_artifact, source_digest  # noqa: E402
+from crossword_ap.wordlist import WORDLIST_RESOURCE, compile_word_list  # noqa: E402
+
+PACKAGE_DIR = ap_stubs.APWORLD_DIR / "crossword_ap"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", type=Path, default=PACKAGE_DIR / WORDLIST_RESOURCE)
+    parser.add_argument("--output", type=Path, default=PACKAGE_DIR / ARTIFACT_RESOURCE)
+    parser.add_argument("--check", action="store_true", help="only verify the artifact matches the source")
+    args = parser.parse_args(argv)
+
+    source = args.source.read_bytes()
+    if args.check:
+        try:
+            current = decode_artifact(args.output.read_bytes()).source_hash
+        except (OSError, ValueError) as error:
+            print(f"{args.output}: {error}", file=sys.stderr)
+            return 1
+        if current != source_digest(source):
+            print(f"{args.output} is stale; rerun {Path(__file__).name}", file=sys.stderr)
+            return 1
+        print(f"{args.output} is up to date")
+        return 0
+
+    artifact = compile_word_list(source)
+    args.output.write_bytes(artifact)
+    print(f"Wrote {args.output} ({len(artifact)} bytes from {len(source)} bytes of text)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Parse and validate a directory of .puz files into a puzzle catalog.
+
+Every .puz file under the directories is checked (checksums included) and validated against the
+CrosswordAP limits across a process pool, and the results are written to a SQLite catalog. Running
+it again only re-reads new or changed files:
+
+    python apworld/tools/ingest_puz.py ~/puzzles --catalog crossword_puzzles.db
+    python apworld/tools/ingest_puz.py ~/puzzles --catalog crossword_puzzles.db --list --words 20
+
+--archive also packs every valid puzzle into one .puz archive, readable with puz_parser.PuzArchive.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+import ap_stubs
+
+ap_stubs.install()
+
+from crossword_ap.puz_catalog import PuzCatalog  # noqa: E402
+from crossword_ap.puz_parser import write_puz_archive  # noqa: E402
+
+# Rejection reasons shown in the summary; the rest are counted under "other".
+TOP_REASONS = 8
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directories", type=Path, nargs="*")
+    parser.add_argument("--catalog", type=Path, required=True)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--list", action="store_true", help="print the valid puzzles in the catalog")
+    parser.add_argument("--words", type=int, help="with --list, only puzzles with this many words")
+    parser.add_argument("--archive", type=Path, help="write the valid puzzles to this .puz archive")
+    args = parser.parse_args(argv)
+    for directory in args.directories:
+        if not directory.is_dir():
+            parser.error(f"{directory} is not a directory")
+
+    with PuzCatalog(args.catalog) as catalog:
+        for directory in args.directories:
+            started = time.perf_counter()
+            parsed, removed = catalog.ingest(directory, args.workers)
+            print(
+                f"{directory}: parsed {parsed} files, removed {removed} missing, "
+                f"{time.perf_counter() - started:.1f}s",
+                file=sys.stderr,
+            )
+
+        entries = catalog.entries()
+        valid = sum(entry.valid for entry in entries)
+        print(f"{args.catalog}: {len(entries)} files, {valid} valid for CrosswordAP", file=sys.stderr)
+        reasons = collections.Counter(entry.reason.split(":")[0] for entry in entries if not entry.valid)
+        for reason, count in reasons.most_common(TOP_REASONS):
+            print(f"  {count:6d}  {reason}", file=sys.stderr)
+        other = sum(reasons.values()) - sum(count for _, count in reasons.most_common(TOP_REASONS))
+        if other:
+            print(f"  {other:6d}  other", file=sys.stderr)
+
+        if args.archive:
+            found = catalog.find()
+            written = write_puz_archive(str(args.archive), (Path(entry.path).read_bytes() for entry in found))
+            print(f"Wrote {args.archive}: {written} puzzles", file=sys.stderr)
+
+        if args.list:
+            for entry in catalog.find(args.words):
+                print(f"{entry.width}x{entry.height}\t{entry.word_count}\t{entry.path}\t{entry.title}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,7 @@ const DEBUG_SETUP := false
 const DEBUG_AP_SAVE := false
 const DEBUG_AP_PROCESS := false
 const DEBUG_CLUE_DUMP := false
+const COMPACT_LAYOUT_VERSION := 1
 const CATEGORY_PRIORITY := {
 	"EASY WORDS": 0,
 	"MEDIUM WORDS": 1,
@@ -685,7 +686,12 @@ func _input(event: InputEvent) -> void:
 			debug_audit_unsent_solved_entries()
 			get_viewport().set_input_as_handled()
 
-func _convert_archipelago_layout(layout: Dictionary) -> Dictionary:
+func _convert_archipelago_layout(source_layout: Dictionary) -> Dictionary:
+	var layout := source_layout
+	if layout.has("version"):
+		layout = _expand_compact_layout(layout)
+		if layout.is_empty():
+			return {}
 	var converted := {}
 	var mask_variant = layout.get("mask", [])
 	var mask_array: Array[String] = []
@@ -724,6 +730,64 @@ func _convert_archipelago_layout(layout: Dictionary) -> Dictionary:
 		return {}
 	return converted
 
+# Turns the compact slot data layout (board string, columnar entries) back into the legacy shape.
+func _expand_compact_layout(layout: Dictionary) -> Dictionary:
+	var version := int(layout.get("version", 0))
+	if version != COMPACT_LAYOUT_VERSION:
+		push_warning("Unsupported compact puzzle layout version %d." % version)
+		return {}
+	var rows := int(layout.get("rows", 0))
+	var cols := int(layout.get("cols", 0))
+	var cells := str(layout.get("board", ""))
+	if rows <= 0 or cols <= 0 or cells.length() != rows * cols:
+		return {}
+	var board: Array = []
+	var mask: Array = []
+	for r in range(rows):
+		var row_array: Array = []
+		var mask_row := ""
+		for c in range(cols):
+			var cell := cells[r * cols + c]
+			row_array.append(cell)
+			mask_row += "#" if cell == "#" else "."
+		board.append(row_array)
+		mask.append(mask_row)
+
+	var columns_variant = layout.get("entries", {})
+	var categories_variant = layout.get("categories", [])
+	if typeof(columns_variant) != TYPE_DICTIONARY or typeof(categories_variant) != TYPE_ARRAY:
+		return {}
+	var columns: Dictionary = columns_variant
+	var categories: Array = categories_variant
+	var words: Array = columns.get("word", [])
+	var clues: Array = columns.get("clue", [])
+	var category_ids: Array = columns.get("category", [])
+	var directions := str(columns.get("direction", ""))
+	var start_rows: Array = columns.get("row", [])
+	var start_cols: Array = columns.get("col", [])
+	var location_indices: Array = columns.get("location_index", [])
+	var count := words.size()
+	for column in [clues, category_ids, start_rows, start_cols, location_indices]:
+		if column.size() != count:
+			return {}
+	if directions.length() != count:
+		return {}
+	var entries: Array = []
+	for idx in range(count):
+		var category_id := int(category_ids[idx])
+		var category := ""
+		if category_id >= 0 and category_id < categories.size():
+			category = str(categories[category_id])
+		entries.append({
+			"word": str(words[idx]),
+			"clue": str(clues[idx]),
+			"category": category,
+			"direction": "across" if directions[idx] == "A" else "down",
+			"start": [int(start_rows[idx]), int(start_cols[idx])],
+			"location_index": int(location_indices[idx]),
+		})
+	return {"board": board, "mask": mask, "entries": entries}
+
 func _refresh_revealed_clue_buttons() -> void:
 	for entry_variant in _all_entries():
 		var entry: Dictionary = entry_variant